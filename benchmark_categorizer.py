@@ -14,12 +14,12 @@ def create_dummy_rules(num_rules):
 
     return {"rules": rules}
 
-def run_benchmark():
+def run_benchmark(num_rules=100):
     # Create a temporary rules file
     fd, path = tempfile.mkstemp(suffix='.json')
     try:
         with os.fdopen(fd, 'w') as f:
-            json.dump(create_dummy_rules(100), f)
+            json.dump(create_dummy_rules(num_rules), f)
 
         categorizer = Categorizer(rules_path=path)
 
@@ -45,13 +45,21 @@ def run_benchmark():
         end_time = time.perf_counter()
         elapsed = end_time - start_time
 
-        print(f"Benchmark completed in {elapsed:.4f} seconds.")
+        print(f"Benchmark with {num_rules} rules completed in {elapsed:.4f} seconds.")
         print(f"Processed {len(descriptions)} descriptions.")
         print(f"Matched: {matched}, Unmatched: {unmatched}")
+
+        start_time = time.perf_counter()
+        categorizer.categorize_many(descriptions)
+        batch_elapsed = time.perf_counter() - start_time
+        print(f"categorize_many over {len(set(descriptions))} distinct descriptions took {batch_elapsed:.4f} seconds.")
         return elapsed
 
     finally:
         os.remove(path)
 
 if __name__ == "__main__":
-    run_benchmark()
+    # Matching runs one automaton over each description, so the cost should stay
+    # nearly flat as the number of rules grows.
+    for num_rules in (10, 100, 1000, 5000):
+        run_benchmark(num_rules)
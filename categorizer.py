@@ -1,12 +1,104 @@
+import collections
 import datetime
 import json
 import os
-import re
 import shutil
 from app_paths import user_data_dir
 
+# Category assigned when no rule keyword matches a description.
+FALLBACK_CATEGORY = 'Sonstiges'
+# Distinct lowercased descriptions whose category is remembered for the current rules.
+CATEGORY_CACHE_SIZE = 50_000
+
+
+def _is_word_char(char):
+    # Same definition of a word character as the \b assertion in re.
+    return char.isalnum() or char == '_'
+
+
+def _is_word_boundary(text, position):
+    before = position > 0 and _is_word_char(text[position - 1])
+    after = position < len(text) and _is_word_char(text[position])
+    return before != after
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over all rule keywords.
+    Finds the best-priority keyword with word boundaries on both sides in one pass over the text.
+    """
+
+    def __init__(self, keywords):
+        """Build the automaton from ``(keyword, priority)`` pairs; a lower priority wins."""
+        self._transitions = [{}]
+        self._failures = [0]
+        # Per state: (priority, keyword length) of every keyword ending there, best first.
+        self._outputs = [{}]
+        self._empty_priority = None
+
+        for keyword, priority in keywords:
+            if not keyword:
+                # re matches \b\b wherever the text has a word boundary.
+                if self._empty_priority is None or priority < self._empty_priority:
+                    self._empty_priority = priority
+                continue
+            state = 0
+            for char in keyword:
+                next_state = self._transitions[state].get(char)
+                if next_state is None:
+                    next_state = len(self._transitions)
+                    self._transitions[state][char] = next_state
+                    self._transitions.append({})
+                    self._failures.append(0)
+                    self._outputs.append({})
+                state = next_state
+            length = len(keyword)
+            self._outputs[state][length] = min(priority, self._outputs[state].get(length, priority))
+
+        queue = collections.deque(self._transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._transitions[state].items():
+                queue.append(next_state)
+                failure = self._failures[state]
+                while failure and char not in self._transitions[failure]:
+                    failure = self._failures[failure]
+                self._failures[next_state] = self._transitions[failure].get(char, 0)
+            # Parents are handled before children, so the failure state's outputs are complete.
+            for length, priority in self._outputs[self._failures[state]].items():
+                if length not in self._outputs[state]:
+                    self._outputs[state][length] = priority
+        self._outputs = [
+            sorted((priority, length) for length, priority in outputs.items())
+            for outputs in self._outputs
+        ]
+
+    def best_match(self, text):
+        """Return the lowest priority of a word-bounded keyword found in ``text``, or ``None``."""
+        best = None
+        if self._empty_priority is not None and any(_is_word_char(char) for char in text):
+            best = self._empty_priority
+
+        transitions, failures, outputs = self._transitions, self._failures, self._outputs
+        state = 0
+        for end, char in enumerate(text, 1):
+            while state and char not in transitions[state]:
+                state = failures[state]
+            state = transitions[state].get(char, 0)
+            for priority, length in outputs[state]:
+                if best is not None and priority >= best:
+                    break
+                if _is_word_boundary(text, end - length) and _is_word_boundary(text, end):
+                    best = priority
+                    break
+        return best
+
 class Categorizer:
     def __init__(self, rules_path=None):
+        self.rules_version = 0
+        self._category_cache = collections.OrderedDict()
+        self._category_cache_version = None
+
         if rules_path is None:
             self.rules_path = str(user_data_dir() / 'rules.json')
             self._migrate_legacy_rules()
@@ -36,13 +128,14 @@ class Categorizer:
         self._compile_regexes()
 
     def _compile_regexes(self):
-        self._compiled_rules = []
-        for rule in self.rules:
-            compiled_keywords = [re.compile(rf'\b{re.escape(k.lower())}\b') for k in rule['keywords']]
-            self._compiled_rules.append({
-                'category': rule['category'],
-                'compiled_keywords': compiled_keywords
-            })
+        self.rules_version += 1
+        # One automaton for every keyword; the rule index is the priority, so the first rule wins.
+        self._rule_categories = [rule['category'] for rule in self.rules]
+        self._matcher = KeywordMatcher(
+            (keyword.lower(), index)
+            for index, rule in enumerate(self.rules)
+            for keyword in rule['keywords']
+        )
 
     def save_rules(self):
         os.makedirs(os.path.dirname(os.path.abspath(self.rules_path)), exist_ok=True)
@@ -103,15 +196,36 @@ class Categorizer:
         self._persist_rules()
 
     def suggest_category(self, description):
-        desc = description.lower()
+        return self._categorize_lowered(description.lower())
 
+    def _categorize_lowered(self, desc):
         # 1. First priority: Manual/Global Rules
-        for compiled_rule in self._compiled_rules:
-            for pattern in compiled_rule['compiled_keywords']:
-                if pattern.search(desc):
-                    return compiled_rule['category']
+        rule_index = self._matcher.best_match(desc)
+        if rule_index is not None:
+            return self._rule_categories[rule_index]
+
+        return FALLBACK_CATEGORY
+
+    def categorize_many(self, descriptions):
+        """Categorize a batch, matching each distinct lowercased description only once."""
+        if self._category_cache_version != self.rules_version:
+            self._category_cache.clear()
+            self._category_cache_version = self.rules_version
 
-        return 'Sonstiges'
+        cache = self._category_cache
+        categories = {}
+        for description in dict.fromkeys(descriptions):
+            desc = description.lower()
+            category = cache.get(desc)
+            if category is None:
+                category = self._categorize_lowered(desc)
+                cache[desc] = category
+                if len(cache) > CATEGORY_CACHE_SIZE:
+                    cache.popitem(last=False)
+            else:
+                cache.move_to_end(desc)
+            categories[description] = category
+        return [categories[description] for description in descriptions]
 
     def add_rule(self, keywords, category):
         # Check if rule with this category already exists and append keywords
@@ -133,7 +247,7 @@ class Categorizer:
         cats = {rule['category'] for rule in self.rules}
         
         # Ensure default essential categories exist
-        defaults = {"Sonstiges", "Supermarkt", "Amazon", "Versicherung", "Computerspiele", "Trading", "Haus"}
+        defaults = {FALLBACK_CATEGORY, "Supermarkt", "Amazon", "Versicherung", "Computerspiele", "Trading", "Haus"}
         cats.update(defaults)
         
         return sorted(list(cats))
@@ -2,24 +2,33 @@
 
 from __future__ import annotations
 
+import bisect
+import copy
 import json
+import multiprocessing
+import os
+import secrets
+import shutil
 import sys
 from pathlib import Path
 
 import pandas as pd
-from PySide6.QtCore import QAbstractTableModel, QModelIndex, QTimer, Qt, Signal
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QPersistentModelIndex, QThread, QTimer, Qt, Signal
 from PySide6.QtGui import QAction
 from PySide6.QtWidgets import (
     QApplication, QComboBox, QDialog, QFileDialog, QFormLayout,
     QGridLayout, QGroupBox, QHeaderView, QHBoxLayout, QInputDialog, QLabel, QLineEdit,
-    QCheckBox, QMainWindow, QMessageBox, QPushButton, QScrollArea, QSpinBox,
-    QSplitter, QTabWidget, QTableView, QTextEdit, QVBoxLayout, QWidget,
+    QCheckBox, QMainWindow, QMessageBox, QPushButton, QScrollArea,
+    QSplitter, QStyle, QStyledItemDelegate, QStyleOptionViewItem, QTabWidget, QTableView, QTextEdit, QVBoxLayout, QWidget,
 )
 
 from categorizer import Categorizer
-from expense_data import ExpenseDataStore
+from expense_data import ExpenseDataStore, default_import_workers
 from parser import Parser
 from scanner import Scanner
+from transaction_db import TransactionDatabase
 
 
 def statistics_for_categories(totals, categories):
@@ -30,6 +39,21 @@ def statistics_for_categories(totals, categories):
 DEFAULT_UNSELECTED_EXPORT_CATEGORIES = {"Abhebung", "Investments", "Firma", "Privat", "Paypal"}
 
 
+def _create_temporary_file(path):
+    """Create an empty file with a unique name next to ``path`` and return its path.
+
+    Unlike ``tempfile.mkstemp`` the file gets the permissions of any newly written file, as the umask allows.
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    while True:
+        temporary_path = os.path.join(directory, f"{name}.{secrets.token_hex(4)}.tmp")
+        try:
+            os.close(os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+        except FileExistsError:
+            continue
+        return temporary_path
+
+
 def transaction_details_dialog(parent, row):
     """Create a read-only transaction dialog whose description can be selected and copied."""
     dialog = QDialog(parent)
@@ -76,6 +100,40 @@ class DescriptionLineEdit(QLineEdit):
         self.keyword_context_menu().exec(event.globalPos())
 
 
+class DescriptionDelegate(QStyledItemDelegate):
+    """Paints descriptions as plain text and creates a selectable editor only for the cell in use."""
+
+    def __init__(self, add_keyword, parent=None):
+        super().__init__(parent)
+        self._add_keyword = add_keyword
+
+    def createEditor(self, parent, option, index):
+        editor = DescriptionLineEdit("", self._add_keyword, parent)
+        editor.setObjectName("transaction_description_editor")
+        editor.setReadOnly(True)
+        editor.setFrame(False)
+        editor.setStyleSheet("QLineEdit { border: 0; background: transparent; padding: 0; }")
+        return editor
+
+    def paint(self, painter, option, index):
+        view = option.widget
+        if view is None or not view.isPersistentEditorOpen(index):
+            super().paint(painter, option, index)
+            return
+        # The transparent editor shows the text itself; paint only the cell background and selection.
+        option = QStyleOptionViewItem(option)
+        self.initStyleOption(option, index)
+        option.text = ""
+        view.style().drawControl(QStyle.CE_ItemViewItem, option, painter, view)
+
+    def setEditorData(self, editor, index):
+        editor.setText(str(index.data(Qt.EditRole) or ""))
+        editor.setToolTip(editor.text())
+
+    def setModelData(self, editor, model, index):
+        pass  # Descriptions are read-only.
+
+
 def selected_expenses_for_export(frame, categories):
     """Return the selected expense transactions with month and year columns for reporting."""
     expenses = frame[(frame["amount"] < 0) & frame["category"].isin(categories)].copy()
@@ -87,56 +145,105 @@ def selected_expenses_for_export(frame, categories):
     return expenses
 
 
-def write_yearly_statistics_export(path, expenses, categories, rules):
-    """Write selected expense data in the legacy multi-sheet annual report structure."""
-    with pd.ExcelWriter(path, engine="openpyxl") as writer:
-        for month in sorted(expenses["Month"].unique()):
-            summary = (expenses[expenses["Month"] == month].groupby("category", as_index=False)["amount"].sum()
-                       .sort_values("amount", ascending=False))
-            total = pd.DataFrame([{"category": "TOTAL", "amount": summary["amount"].sum()}])
-            pd.concat([summary, total], ignore_index=True).to_excel(writer, sheet_name=month, index=False)
-
-        monthly_totals = expenses.groupby("Month", as_index=False)["amount"].sum().sort_values("Month")
-        monthly_total = pd.DataFrame([{"Month": "GRAND TOTAL", "amount": monthly_totals["amount"].sum()}])
-        pd.concat([monthly_totals, monthly_total], ignore_index=True).to_excel(writer, sheet_name="Monthly Totals", index=False)
-
-        months = expenses["Month"].nunique()
-        averages = expenses.groupby("category", as_index=False)["amount"].sum()
-        averages["average_per_month"] = (averages["amount"] / months).round(2)
-        averages = averages[["category", "average_per_month"]].sort_values("average_per_month", ascending=False)
-        averages.to_excel(writer, sheet_name="Average Monthly Expenses", index=False)
-        average_sheet = writer.sheets["Average Monthly Expenses"]
-        for cell in average_sheet["B"][1:]:
-            cell.number_format = "#,##0.##"
-
-        comparison = expenses.pivot_table(index="category", columns="Year", values="amount", aggfunc="sum", fill_value=0).reset_index()
-        year_columns = [column for column in comparison.columns if column != "category"]
-        comparison["_total"] = comparison[year_columns].sum(axis=1)
-        comparison = comparison.sort_values("_total", ascending=False).drop(columns="_total")
-        comparison_total = pd.DataFrame([{**{"category": "TOTAL"}, **comparison[year_columns].sum().to_dict()}])
-        pd.concat([comparison, comparison_total], ignore_index=True).to_excel(writer, sheet_name="Yearly Comparison", index=False)
-
-        yearly_summary = (expenses.groupby(["Year", "category"], as_index=False)["amount"].sum()
-                          .sort_values(["Year", "amount"], ascending=[False, False]))
-        yearly_total = pd.DataFrame([{"Year": "GRAND TOTAL", "category": "-", "amount": yearly_summary["amount"].sum()}])
-        pd.concat([yearly_summary, yearly_total], ignore_index=True).to_excel(writer, sheet_name="Yearly Summary", index=False)
-
-        configured = {}
-        for rule in rules:
-            category = rule.get("category")
-            if category:
-                configured.setdefault(category, set()).update(rule.get("keywords", []))
-        configured_categories = pd.DataFrame([
-            {"category": category, "keywords": ", ".join(sorted(keywords))}
-            for category, keywords in sorted(configured.items(), key=lambda item: item[0].casefold())
-        ], columns=["category", "keywords"])
-        configured_categories.to_excel(writer, sheet_name="Configured Categories", index=False)
+def _write_export_sheet(workbook, title, header, rows, number_formats=None):
+    """Stream one report sheet: a header row followed by value rows."""
+    sheet = workbook.create_sheet(title)
+    sheet.append(header)
+    for row in rows:
+        if number_formats:
+            row = list(row)
+            for column, number_format in number_formats.items():
+                row[column] = WriteOnlyCell(sheet, row[column]); row[column].number_format = number_format
+        sheet.append(row)
+
+
+def _yearly_export_sheets(spent, rules):
+    """Yield ``(title, header, rows, number_formats)`` for every sheet of the yearly report."""
+    by_month = spent.sort_values(["Month", "amount"], ascending=[True, False], kind="stable")
+    for month, summary in by_month.groupby("Month", sort=False):
+        yield (
+            month, ["category", "amount"],
+            [*zip(summary["category"], summary["amount"].tolist()), ("TOTAL", summary["amount"].sum())], None,
+        )
+
+    monthly_totals = spent.groupby("Month")["amount"].sum()
+    yield (
+        "Monthly Totals", ["Month", "amount"],
+        [*zip(monthly_totals.index, monthly_totals.tolist()), ("GRAND TOTAL", monthly_totals.sum())], None,
+    )
+
+    averages = (spent.groupby("category")["amount"].sum() / len(monthly_totals)).round(2).sort_values(ascending=False, kind="stable")
+    yield (
+        "Average Monthly Expenses", ["category", "average_per_month"],
+        zip(averages.index, averages.tolist()), {1: "#,##0.##"},
+    )
+
+    yearly = spent.groupby(["Year", "category"])["amount"].sum()
+    comparison = yearly.unstack("Year", fill_value=0)
+    comparison = comparison.loc[comparison.sum(axis=1).sort_values(ascending=False, kind="stable").index]
+    yield (
+        "Yearly Comparison", ["category", *comparison.columns.tolist()],
+        [*([category, *values] for category, values in zip(comparison.index, comparison.values.tolist())),
+         ["TOTAL", *comparison.sum().tolist()]], None,
+    )
+
+    yearly_summary = yearly.reset_index().sort_values(["Year", "amount"], ascending=[False, False], kind="stable")
+    yield (
+        "Yearly Summary", ["Year", "category", "amount"],
+        [*zip(yearly_summary["Year"].tolist(), yearly_summary["category"], yearly_summary["amount"].tolist()),
+         ("GRAND TOTAL", "-", yearly_summary["amount"].sum())], None,
+    )
+
+    configured = {}
+    for rule in rules:
+        category = rule.get("category")
+        if category:
+            configured.setdefault(category, set()).update(rule.get("keywords", []))
+    yield (
+        "Configured Categories", ["category", "keywords"],
+        [(category, ", ".join(sorted(keywords))) for category, keywords in sorted(configured.items(), key=lambda item: item[0].casefold())], None,
+    )
+
+
+def write_yearly_statistics_export(path, expenses, categories, rules, progress=None):
+    """Write selected expense data in the legacy multi-sheet annual report structure.
+
+    Every sheet is derived from one grouping of the expenses by month and category, and the
+    workbook is written in write-only mode, so rows go to disk instead of being kept in memory.
+    The report is saved to a temporary file next to ``path`` and renamed into place when complete.
+    ``progress(written, total)`` is called after every sheet; when it returns ``False`` the export
+    stops without touching ``path``. Returns whether the report was written.
+    """
+    spent = (expenses.groupby(["Month", "Year", "category"], observed=True)["amount"].sum().reset_index()
+             .astype({"category": object}))
+    # One sheet per month, then the five summary sheets.
+    sheet_count = spent["Month"].nunique() + 5
+    workbook = Workbook(write_only=True)
+    for written, sheet in enumerate(_yearly_export_sheets(spent, rules), start=1):
+        _write_export_sheet(workbook, *sheet)
+        if progress is not None and progress(written, sheet_count) is False:
+            for sheet in workbook.worksheets:
+                sheet.close()
+            return False
+
+    temporary_path = _create_temporary_file(path)
+    try:
+        workbook.save(temporary_path)
+        if os.path.exists(path):
+            shutil.copymode(path, temporary_path)
+        os.replace(temporary_path, path)
+    except BaseException:
+        try:
+            os.remove(temporary_path)
+        except OSError:
+            pass
+        raise
+    return True
 
 class DataFrameModel(QAbstractTableModel):
     def __init__(self, columns, parent=None):
         super().__init__(parent)
         self.columns = columns
-        self.hidden_display_columns = set()
         self.frame = pd.DataFrame(columns=columns)
 
     def set_frame(self, frame):
@@ -155,8 +262,6 @@ class DataFrameModel(QAbstractTableModel):
             return None
         value = self.frame.iat[index.row(), index.column()]
         column = self.columns[index.column()]
-        if role == Qt.DisplayRole and column in self.hidden_display_columns:
-            return ""
         if role == Qt.TextAlignmentRole and column == "Amount":
             return Qt.AlignRight | Qt.AlignVCenter
         if pd.isna(value):
@@ -175,6 +280,95 @@ class DataFrameModel(QAbstractTableModel):
         return super().headerData(section, orientation, role)
 
 
+class TransactionTableModel(QAbstractTableModel):
+    """Exposes a whole filtered, sorted result and fetches it block by block while the view scrolls.
+
+    Display strings are formatted once per fetched block and kept per column, so painting a
+    cell is a list lookup.
+    """
+    BLOCK_SIZE = 200
+
+    def __init__(self, columns, frame_columns, parent=None):
+        super().__init__(parent)
+        self.columns, self.frame_columns = columns, frame_columns
+        self.total = 0
+        self._fetch_block = None
+        # Fetched frames and the view row each one starts at; a block can be short when the data changed meanwhile.
+        self._blocks, self._block_starts = [], []
+        self._display = [[] for _ in columns]
+
+    def set_source(self, fetch_block, minimum_rows=0):
+        """Show a new result; ``fetch_block(number)`` returns a block's frame and the total row count."""
+        self.beginResetModel()
+        self._fetch_block, self._blocks, self._block_starts, self._display = fetch_block, [], [], [[] for _ in self.columns]
+        self.total = 0
+        self._append_block()
+        while len(self._display[0]) < min(minimum_rows, self.total) and len(self._blocks[-1]):
+            self._append_block()
+        self.endResetModel()
+
+    def _append_block(self, frame=None):
+        if frame is None:
+            frame, self.total = self._fetch_block(len(self._blocks))
+        frame = frame.reindex(columns=self.frame_columns)
+        self._blocks.append(frame); self._block_starts.append(len(self._display[0]))
+        for display, column in zip(self._display, self.frame_columns):
+            display.extend(self._format(column, frame[column]))
+
+    @staticmethod
+    def _format(column, values):
+        if column == "amount":
+            return ["" if pd.isna(value) else f"{value:.2f} €" for value in values.tolist()]
+        if column == "date":
+            return values.dt.strftime("%Y-%m-%d").fillna("").tolist()
+        return values.astype(object).where(values.notna(), "").astype(str).tolist()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._display[0])
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and len(self._display[0]) < self.total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        start = len(self._display[0])
+        frame, self.total = self._fetch_block(len(self._blocks))
+        if frame.empty:
+            # The result shrank since the last refresh; nothing is left to fetch until the next one.
+            self.total = min(self.total, start)
+            return
+        self.beginInsertRows(QModelIndex(), start, start + len(frame) - 1)
+        self._append_block(frame)
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        column = self.columns[index.column()]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self._display[index.column()][index.row()]
+        if role == Qt.TextAlignmentRole and column == "Amount":
+            return Qt.AlignRight | Qt.AlignVCenter
+        if role == Qt.ToolTipRole and column == "Description":
+            return self._display[index.column()][index.row()] or None
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.columns[section]
+        return super().headerData(section, orientation, role)
+
+    def row(self, row):
+        """The fetched transaction at a view row, with table column names."""
+        block = bisect.bisect_right(self._block_starts, row) - 1
+        values = self._blocks[block].iloc[row - self._block_starts[block]]
+        return values.rename(dict(zip(self.frame_columns, self.columns)))
+
+
 class RuleTableModel(DataFrameModel):
     """Editable rule model that permits keyword changes but protects category names."""
     saved = Signal(str)
@@ -215,8 +409,71 @@ class RuleTableModel(DataFrameModel):
         return True
 
 
+class ImportWorker(QThread):
+    """Parses statements off the GUI thread and hands them back batch by batch in import order."""
+    statement_parsed = Signal(int, object, object, bool)
+    failed = Signal(str)
+
+    def __init__(self, store, jobs, parent=None):
+        super().__init__(parent)
+        self.store, self.jobs = store, list(jobs)
+        self.cancelled = False
+
+    def run(self):
+        statements = self.store.parse_statement_batches(self.jobs)
+        try:
+            for position, frame, report, complete in statements:
+                if self.isInterruptionRequested():
+                    # Qt clears the interruption request when the thread ends, so the outcome is kept here.
+                    self.cancelled = True
+                    break
+                self.statement_parsed.emit(position, frame, report, complete)
+        except Exception as error:  # Reported in the window; the thread must not die silently.
+            self.failed.emit(f"Import stopped: {error}")
+        finally:
+            statements.close()
+
+
+class CategoryWriter(QThread):
+    """Writes the categories the store assigned to the database off the GUI thread."""
+
+    def __init__(self, store, categories, parent=None):
+        super().__init__(parent)
+        self.store, self.categories = store, categories
+
+    def run(self):
+        self.store.save_categories(self.categories)
+
+
+class ExportWorker(QThread):
+    """Writes the yearly report off the GUI thread and reports every finished sheet."""
+    progress = Signal(int, int)
+    exported = Signal(str)
+    failed = Signal(str)
+
+    def __init__(self, path, expenses, categories, rules, parent=None):
+        super().__init__(parent)
+        self.path, self.expenses, self.categories, self.rules = path, expenses, categories, rules
+        self.written = self.cancelled = False
+
+    def run(self):
+        try:
+            self.written = write_yearly_statistics_export(self.path, self.expenses, self.categories, self.rules, self._sheet_written)
+        except Exception as error:  # Reported in the window; the thread must not die silently.
+            self.failed.emit(str(error))
+            return
+        if self.written:
+            self.exported.emit(str(self.path))
+
+    def _sheet_written(self, written, total):
+        self.progress.emit(written, total)
+        # Qt clears the interruption request when the thread ends, so the outcome is kept here.
+        self.cancelled = self.isInterruptionRequested()
+        return not self.cancelled
+
+
 class ExpenseWindow(QMainWindow):
-    PAGE_SIZE = 20
+    statement_files_changed = Signal(object)
     TABLE_COLUMNS = ["Date", "Description", "Amount", "Category", "Source", "File"]
     FRAME_COLUMNS = ["date", "description", "amount", "category", "source", "file"]
     TRANSACTION_COLUMN_LIMITS = {
@@ -231,12 +488,22 @@ class ExpenseWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.scanner, self.parser, self.categorizer = Scanner(), Parser(), Categorizer()
-        self.store = ExpenseDataStore(self.scanner, self.parser, self.categorizer)
-        self.page, self.sort_column, self.sort_descending = 1, "date", True
+        self.store = ExpenseDataStore(
+            self.scanner, self.parser, self.categorizer, TransactionDatabase(), workers=default_import_workers()
+        )
+        self.sort_column, self.sort_descending = "date", True
+        self._import_worker, self._import_jobs, self._imported_count, self._import_finished_text = None, [], 0, ""
+        self._reload_pending, self._pending_selection, self._changed_statement_files = False, None, set()
+        self._export_worker = self._category_writer = None
         self.setWindowTitle("Expense App Desktop")
         self.resize(1300, 820)
         self._build_ui()
+        self._import_refresh_timer = QTimer(self); self._import_refresh_timer.setSingleShot(True); self._import_refresh_timer.setInterval(250)
+        self._import_refresh_timer.timeout.connect(self._refresh_imported_transactions)
         self.reload_transactions()
+        # The watcher calls back from its own thread; the signal hands the paths to the GUI thread.
+        self.statement_files_changed.connect(self.update_statement_files)
+        self._folder_watcher = self.scanner.watch(self.statement_files_changed.emit)
 
     def _build_ui(self):
         tabs = QTabWidget()
@@ -254,12 +521,13 @@ class ExpenseWindow(QMainWindow):
         controls = QHBoxLayout()
         import_button = QPushButton("Import CSV files…"); import_button.clicked.connect(self.choose_csv_files)
         reload_button = QPushButton("Reload CSVs"); reload_button.clicked.connect(self.reload_folder_csvs)
+        self.cancel_import_button = QPushButton("Cancel import"); self.cancel_import_button.clicked.connect(self.cancel_import); self.cancel_import_button.setVisible(False)
         self.category_filter, self.month_filter = QComboBox(), QComboBox()
         self.search_input = QLineEdit(); self.search_input.setPlaceholderText("Search descriptions as you type")
         reset = QPushButton("Show all transactions"); reset.clicked.connect(self.reset_filters)
         for label, widget in (("Category", self.category_filter), ("Month", self.month_filter), ("Search", self.search_input)):
             controls.addWidget(QLabel(label)); controls.addWidget(widget, 1 if label == "Search" else 0)
-        controls.addWidget(import_button); controls.addWidget(reload_button); controls.addWidget(reset); layout.addLayout(controls)
+        controls.addWidget(import_button); controls.addWidget(reload_button); controls.addWidget(self.cancel_import_button); controls.addWidget(reset); layout.addLayout(controls)
         self.category_filter.currentTextChanged.connect(self.filters_changed)
         self.month_filter.currentTextChanged.connect(self.filters_changed)
         self.search_input.textChanged.connect(self.filters_changed)
@@ -267,21 +535,20 @@ class ExpenseWindow(QMainWindow):
         for label in (self.total_label, self.spent_label, self.categorized_label): metrics.addWidget(label)
         layout.addLayout(metrics)
         self.result_label = QLabel(); layout.addWidget(self.result_label)
-        self.transaction_model = DataFrameModel(self.TABLE_COLUMNS, self); self.transaction_model.hidden_display_columns.add("Description")
+        self.transaction_model = TransactionTableModel(self.TABLE_COLUMNS, self.FRAME_COLUMNS, self)
         self.transaction_table = QTableView(); self.transaction_table.setModel(self.transaction_model)
         self.transaction_table.setSelectionBehavior(QTableView.SelectRows); self.transaction_table.setEditTriggers(QTableView.NoEditTriggers)
         self.transaction_table.setTextElideMode(Qt.ElideRight)
+        self.description_delegate = DescriptionDelegate(self.add_description_keyword, self.transaction_table)
+        self.transaction_table.setItemDelegateForColumn(self.TABLE_COLUMNS.index("Description"), self.description_delegate)
+        self._description_editor_index = None
+        self.transaction_table.setMouseTracking(True); self.transaction_table.entered.connect(self._open_description_editor)
         header = self.transaction_table.horizontalHeader()
         header.setStretchLastSection(False); header.setMinimumSectionSize(80)
         header.setSectionResizeMode(QHeaderView.Interactive)
         header.sectionClicked.connect(self.change_sort)
         self.transaction_table.doubleClicked.connect(self.show_transaction_details); layout.addWidget(self.transaction_table, 1)
-        pagination = QHBoxLayout(); self.previous = QPushButton("Previous"); self.next = QPushButton("Next")
-        self.page_spin = QSpinBox(); self.page_spin.setMinimum(1); self.page_label = QLabel()
-        self.previous.clicked.connect(lambda: self.set_page(self.page - 1)); self.next.clicked.connect(lambda: self.set_page(self.page + 1)); self.page_spin.valueChanged.connect(self.set_page)
-        for widget in (self.previous, QLabel("Page"), self.page_spin, self.page_label, self.next): pagination.addWidget(widget)
-        pagination.addStretch(); layout.addLayout(pagination)
-        self.report_model = DataFrameModel(["File", "status", "rows_read", "imported_expenses", "skipped_non_expenses", "details"], self)
+        self.report_model = DataFrameModel(["File", "status", "rows_read", "imported_expenses", "skipped_non_expenses", "skipped_invalid_dates", "skipped_duplicates", "dialect", "details"], self)
         self.import_results_group = QGroupBox("Import results (show details)")
         self.import_results_group.setCheckable(True)
         self.import_results_group.setChecked(False)
@@ -292,9 +559,11 @@ class ExpenseWindow(QMainWindow):
         self.import_results_summary.setWordWrap(True)
         self.import_results_details = QTableView()
         self.import_results_details.setModel(self.report_model)
-        self.import_results_details.setMaximumHeight(155)
+        self.import_results_details.setMaximumHeight(155); self.import_results_details.setSelectionBehavior(QTableView.SelectRows)
+        self.remove_statements_button = QPushButton("Remove selected statements"); self.remove_statements_button.clicked.connect(self.remove_selected_statements)
         group_layout.addWidget(self.import_results_summary)
         group_layout.addWidget(self.import_results_details)
+        group_layout.addWidget(self.remove_statements_button, 0, Qt.AlignLeft)
         self.import_results_group.toggled.connect(self._toggle_import_results_details)
         self._toggle_import_results_details(False)
         layout.addWidget(self.import_results_group)
@@ -341,29 +610,152 @@ class ExpenseWindow(QMainWindow):
         selection_controls.addWidget(select_all); selection_controls.addWidget(clear_all); selection_controls.addStretch()
         export_selection_layout.addLayout(selection_controls)
         layout.addWidget(export_selection, 1)
-        export = QPushButton("Export selected categories yearly report to Excel…"); export.clicked.connect(self.export_statistics); layout.addWidget(export); return page
+        export_controls = QHBoxLayout()
+        self.export_button = QPushButton("Export selected categories yearly report to Excel…"); self.export_button.clicked.connect(self.export_statistics)
+        self.cancel_export_button = QPushButton("Cancel export"); self.cancel_export_button.clicked.connect(self.cancel_export); self.cancel_export_button.setVisible(False)
+        self.export_status = QLabel()
+        export_controls.addWidget(self.export_button, 1); export_controls.addWidget(self.cancel_export_button); layout.addLayout(export_controls); layout.addWidget(self.export_status); return page
 
     def choose_csv_files(self):
         files, _ = QFileDialog.getOpenFileNames(self, "Import bank statements", "", "CSV files (*.csv)")
         if files: self.reload_transactions(files)
 
     def reload_transactions(self, selected_files=None):
-        self.store.reload(selected_files); self.scan_label.setText(f"Scanning folder: {self.scanner.watch_path}")
-        self._populate_filters(); self.page = 1; self.refresh_transactions(); self.refresh_rules(); self.refresh_statistics()
+        """Import in the background; requests made while an import runs restart it once with the latest selection."""
+        if selected_files is not None:
+            self._pending_selection = selected_files
+        if self._import_worker is not None:
+            self._reload_pending = True
+            self._import_worker.requestInterruption()
+            return
+        selection, self._pending_selection, self._reload_pending = self._pending_selection, None, False
+        self._changed_statement_files.clear()  # The full import rescans the folder anyway.
+        jobs = self.store.begin_reload(selection)
+        self._start_import(jobs, f"Reloaded {len(jobs)} CSV file(s) from {self.scanner.watch_path}.", keep_position=False)
+
+    def _start_import(self, jobs, finished_text, keep_position=True):
+        """Parse the ``(path, source)`` statements in the background; the store already dropped their old rows."""
+        self._import_jobs, self._imported_count, self._import_finished_text = jobs, 0, finished_text
+        self._import_worker = ImportWorker(self.store, jobs, self)
+        self._import_worker.statement_parsed.connect(self._statement_imported)
+        self._import_worker.failed.connect(self._import_failed)
+        self._import_worker.finished.connect(self._import_finished)
+        self.cancel_import_button.setVisible(True); self._show_import_progress()
+        self._refresh_imported_transactions(keep_position)
+        self._import_worker.start()
+
+    def cancel_import(self):
+        if self._import_worker is not None:
+            self._reload_pending = False
+            self._import_worker.requestInterruption()
+
+    def _statement_imported(self, position, frame, report, complete):
+        path, source = self._import_jobs[position]
+        first_rows = not len(self.store.transactions)
+        self.store.add_statement(path, source, frame, report, complete)
+        if complete: self._imported_count = position + 1; self._save_categories()
+        self._show_import_progress(None if complete else report.get("rows_read"))
+        if first_rows and len(self.store.transactions):
+            # Show the first rows at once; queued batches would otherwise hold back the refresh timer.
+            self._import_refresh_timer.stop(); self._refresh_imported_transactions()
+        elif not self._import_refresh_timer.isActive():
+            self._import_refresh_timer.start()
+
+    def _show_import_progress(self, rows_read=None):
+        total = len(self._import_jobs)
+        current = Path(self._import_jobs[self._imported_count][0]).name if self._imported_count < total else ""
+        if rows_read: current += f" ({rows_read:,} rows read)"
+        self.scan_label.setText(f"Importing {self._imported_count} of {total} CSV file(s) from {self.scanner.watch_path}… {current}")
+
+    def _import_failed(self, message):
+        self.scan_label.setText(message)
+        QMessageBox.warning(self, "Import CSVs", message)
+
+    def _import_finished(self):
+        worker, self._import_worker = self._import_worker, None
+        worker.deleteLater(); self.cancel_import_button.setVisible(False)
+        self.store.discard_pending_statement()  # A statement cut off mid-file is not imported.
+        if self._reload_pending:
+            self.reload_transactions()
+            return
+        self._import_refresh_timer.stop(); self._refresh_imported_transactions(); self.refresh_rules()
+        total = len(self._import_jobs)
+        if self._imported_count < total and worker.cancelled:
+            self.scan_label.setText(f"Import cancelled after {self._imported_count} of {total} CSV file(s). {len(self.store.transactions)} transaction(s) available.")
+        elif self._imported_count == total:
+            self.scan_label.setText(f"{self._import_finished_text} {len(self.store.transactions)} transaction(s) available.")
+        if self._changed_statement_files:
+            paths, self._changed_statement_files = list(self._changed_statement_files), set()
+            self.update_statement_files(paths)
+
+    def update_statement_files(self, paths):
+        """Apply CSVs added or changed in the watched folder without a full reload, parsing them in the background.
+
+        Deleted CSVs keep their statements; only ``remove_selected_statements`` drops them.
+        """
+        if self._import_worker is not None:
+            self._changed_statement_files.update(paths)
+            return
+        jobs, updated = self.store.begin_scanned_update(paths)
+        if updated:
+            self._start_import(jobs, f"Updated {updated} CSV file(s) in {self.scanner.watch_path}.")
+
+    def remove_selected_statements(self):
+        """Delete the statements selected in the import results from the app and its database; the CSV files stay."""
+        rows = sorted({index.row() for index in self.import_results_details.selectionModel().selectedRows()})
+        if not rows: return QMessageBox.information(self, "Remove statements", "Select the statements to remove in the import results.")
+        if self._import_worker is not None: return QMessageBox.information(self, "Remove statements", "Wait until the running import has finished.")
+        reports = self.store.import_reports; statements = [(reports[row]["path"], reports[row]["source"]) for row in rows]
+        question = f"Remove {len(statements)} statement(s) and their transactions? The CSV files are not deleted; files in {self.scanner.watch_path} are imported again on the next reload."
+        if QMessageBox.question(self, "Remove statements", question) != QMessageBox.Yes: return
+        jobs, removed = self.store.begin_statement_removal(statements)
+        if jobs: return self._start_import(jobs, f"Removed {removed} statement(s).")
+        self._refresh_imported_transactions(); self.scan_label.setText(f"Removed {removed} statement(s). {len(self.store.transactions)} transaction(s) available.")
+
+    def _refresh_imported_transactions(self, keep_position=True):
+        self._populate_filters(); self.refresh_transactions(keep_position); self.refresh_statistics()
+
+    def closeEvent(self, event):
+        if self._folder_watcher is not None:
+            self._folder_watcher.stop(); self._folder_watcher = None
+        if self._import_worker is not None:
+            self._reload_pending = False
+            self._import_worker.requestInterruption(); self._import_worker.wait()
+        if self._export_worker is not None:
+            self._export_worker.requestInterruption(); self._export_worker.wait()
+        if self._category_writer is not None: self._category_writer.wait()
+        self.store.save_categories(self.store.take_unsaved_categories())
+        super().closeEvent(event)
+
+    def recategorize_transactions(self):
+        """Apply changed rules to the loaded transactions without parsing the statements again."""
+        self.store.recategorize(); self._save_categories()
+        self._populate_filters(); self.refresh_transactions(); self.refresh_rules(); self.refresh_statistics()
+
+    def _save_categories(self):
+        """Write newly assigned categories in the background; changes made meanwhile go with the next write."""
+        if self._category_writer is not None: return
+        categories = self.store.take_unsaved_categories()
+        if not categories: return
+        self._category_writer = CategoryWriter(self.store, categories, self)
+        self._category_writer.finished.connect(self._category_writer_finished); self._category_writer.start()
+
+    def _category_writer_finished(self):
+        writer, self._category_writer = self._category_writer, None
+        writer.deleteLater(); self._save_categories()
 
     def reload_folder_csvs(self):
         folder = Path(self.scanner.watch_path)
         try:
             if not folder.is_dir():
                 raise NotADirectoryError(folder)
-            files = self.scanner.scan_for_csvs()
+            self.scanner.scan_for_csvs()
         except OSError as error:
             message = f"Could not reload CSVs from {folder}: {error}"
             self.scan_label.setText(message)
             QMessageBox.warning(self, "Reload CSVs", message)
             return False
         self.reload_transactions()
-        self.scan_label.setText(f"Reloaded {len(files)} CSV file(s) from {folder}. {len(self.store.transactions)} transaction(s) available.")
         return True
 
     def _populate_filters(self):
@@ -375,32 +767,35 @@ class ExpenseWindow(QMainWindow):
         self.month_filter.setCurrentText(month if month in [self.month_filter.itemText(i) for i in range(self.month_filter.count())] else "All")
         self.category_filter.blockSignals(False); self.month_filter.blockSignals(False)
 
-    def filters_changed(self, *_): self.page = 1; self.refresh_transactions()
+    def filters_changed(self, *_): self.refresh_transactions(keep_position=False)
     def reset_filters(self):
         self.category_filter.setCurrentText("All"); self.month_filter.setCurrentText("All"); self.search_input.clear(); self.filters_changed()
-    def set_page(self, page): self.page = page; self.refresh_transactions()
 
     def change_sort(self, section):
         column = self.FRAME_COLUMNS[section]
         self.sort_descending = not self.sort_descending if column == self.sort_column else column in ("date", "amount")
-        self.sort_column = column; self.page = 1; self.refresh_transactions()
-
-    def refresh_transactions(self):
-        frame = self.store.filtered(self.category_filter.currentText() or "All", self.month_filter.currentText() or "All", self.search_input.text())
-        if not frame.empty: frame = frame.sort_values(self.sort_column, ascending=not self.sort_descending, kind="stable")
-        total = len(frame); pages = max(1, (total + self.PAGE_SIZE - 1) // self.PAGE_SIZE); self.page = min(max(1, self.page), pages)
-        self.page_spin.blockSignals(True); self.page_spin.setRange(1, pages); self.page_spin.setValue(self.page); self.page_spin.blockSignals(False)
-        start = (self.page - 1) * self.PAGE_SIZE; display = frame.iloc[start:start + self.PAGE_SIZE]
-        shown = display.rename(columns=dict(zip(self.FRAME_COLUMNS, self.TABLE_COLUMNS)))
-        self.transaction_model.set_frame(shown); self._install_description_editors(); self._schedule_transaction_column_resize(); self.result_label.setText(f"Showing {start + 1 if total else 0}–{min(start + self.PAGE_SIZE, total)} of {total} transactions")
-        self.page_label.setText(f"of {pages}"); self.previous.setEnabled(self.page > 1); self.next.setEnabled(self.page < pages)
-        full = self.store.dataframe; self.total_label.setText(f"Total transactions: {len(full)}"); self.spent_label.setText(f"Total spent: {abs(full.loc[full['amount'] < 0, 'amount'].sum()):.2f} €")
-        self.categorized_label.setText(f"Categorized: {(full['category'] != 'Sonstiges').sum()}")
+        self.sort_column = column; self.refresh_transactions(keep_position=False)
+
+    def refresh_transactions(self, keep_position=True):
+        """Show the current view; rows are fetched from the store in blocks as the table scrolls.
+
+        With ``keep_position`` the rows loaded so far are fetched again and the scroll position is
+        kept, so imports and re-categorization do not jump back to the top.
+        """
+        view = (self.category_filter.currentText() or "All", self.month_filter.currentText() or "All", self.search_input.text(), self.sort_column, self.sort_descending)
+        model, scroll_bar = self.transaction_model, self.transaction_table.verticalScrollBar()
+        loaded, scroll = (model.rowCount(), scroll_bar.value()) if keep_position else (0, 0)
+        block_size = model.BLOCK_SIZE
+        self._close_description_editor(); model.set_source(lambda block: self.store.page(*view, page=block + 1, page_size=block_size), loaded)
+        scroll_bar.setValue(scroll); self._schedule_transaction_column_resize()
+        self.result_label.setText(f"{model.total} matching transactions")
+        totals = self.store.totals; self.total_label.setText(f"Total transactions: {totals.transactions}"); self.spent_label.setText(f"Total spent: {totals.spent:.2f} €")
+        self.categorized_label.setText(f"Categorized: {totals.categorized}")
         self._refresh_import_results(self.store.reports_dataframe())
 
     def _toggle_import_results_details(self, visible):
         """Show the full per-file report only when the user requests it."""
-        self.import_results_details.setVisible(visible)
+        self.import_results_details.setVisible(visible); self.remove_statements_button.setVisible(visible)
         self.import_results_group.setTitle(
             "Import results (hide details)" if visible else "Import results (show details)"
         )
@@ -416,40 +811,47 @@ class ExpenseWindow(QMainWindow):
 
         imported = int(pd.to_numeric(reports.get("imported_expenses", 0), errors="coerce").fillna(0).sum())
         statuses = reports.get("status", pd.Series("", index=reports.index)).fillna("").astype(str)
-        failures = ~statuses.str.casefold().eq("imported")
+        failures = ~statuses.str.casefold().isin(["imported", "importing"])
         failed_files = int(failures.sum())
         skipped_errors = int(pd.to_numeric(reports.get("skipped_errors", 0), errors="coerce").fillna(0).sum())
-        if failed_files or skipped_errors:
+        invalid_dates = int(pd.to_numeric(reports.get("skipped_invalid_dates", 0), errors="coerce").fillna(0).sum())
+        duplicates = int(pd.to_numeric(reports.get("skipped_duplicates", 0), errors="coerce").fillna(0).sum())
+        duplicate_text = f", {duplicates} duplicate(s) from overlapping files skipped" if duplicates else ""
+        if failed_files or skipped_errors or invalid_dates:
             self.import_results_summary.setStyleSheet("color: #a11;")
-            issue_text = f"{failed_files} file(s) could not be imported" if failed_files else f"{skipped_errors} row(s) could not be processed"
+            issues = []
+            if failed_files: issues.append(f"{failed_files} file(s) could not be imported")
+            elif skipped_errors: issues.append(f"{skipped_errors} row(s) could not be processed")
+            if invalid_dates: issues.append(f"{invalid_dates} row(s) with an unreadable date skipped")
+            issue_text = ", ".join(issues)
             self.import_results_summary.setText(
-                f"{len(reports)} file(s): {imported} expense(s) imported; {issue_text}. Details are open below."
+                f"{len(reports)} file(s): {imported} expense(s) imported{duplicate_text}; {issue_text}. Details are open below."
             )
             self.import_results_group.setChecked(True)
         else:
             self.import_results_summary.setStyleSheet("color: #1f7a1f;")
             self.import_results_summary.setText(
-                f"{len(reports)} file(s): {imported} expense(s) imported. Select the section title to show details."
+                f"{len(reports)} file(s): {imported} expense(s) imported{duplicate_text}. Select the section title to show details."
             )
             self.import_results_group.setChecked(False)
 
-    def _install_description_editors(self):
-        """Put read-only line editors in description cells for in-place selection and copying."""
-        column = self.TABLE_COLUMNS.index("Description")
-        for row in range(self.transaction_model.rowCount()):
-            editor = DescriptionLineEdit(
-                str(self.transaction_model.frame.iloc[row]["Description"]),
-                self.add_description_keyword,
-                self.transaction_table,
-            )
-            editor.setObjectName("transaction_description_editor")
-            editor.setReadOnly(True)
-            editor.setFrame(False)
-            editor.setStyleSheet("QLineEdit { border: 0; background: transparent; padding: 0; }")
-            editor.setToolTip(editor.text())
-            self._reset_description_editor_position(editor)
-            self.transaction_table.setIndexWidget(self.transaction_model.index(row, column), editor)
-            QTimer.singleShot(0, lambda line_edit=editor: self._reset_description_editor_position(line_edit))
+    def _open_description_editor(self, index):
+        """Give the hovered description cell a selectable editor; all other cells stay painted text."""
+        if self.TABLE_COLUMNS[index.column()] != "Description" or index == self._description_editor_index:
+            return
+        self._close_description_editor()
+        self.transaction_table.openPersistentEditor(index)
+        self._description_editor_index = QPersistentModelIndex(index)
+        editor = self.transaction_table.indexWidget(index)
+        if editor is not None:
+            # The view selects all text of a new line editor; show it from its first character instead.
+            editor.deselect()
+            editor.setCursorPosition(0)
+
+    def _close_description_editor(self):
+        editor_index, self._description_editor_index = self._description_editor_index, None
+        if editor_index is not None and editor_index.isValid():
+            self.transaction_table.closePersistentEditor(editor_index)
 
     def add_description_keyword(self, keyword):
         """Choose a rule category and add selected description text as its keyword."""
@@ -500,20 +902,11 @@ class ExpenseWindow(QMainWindow):
             self.result_label.setStyleSheet("color: #a11;")
             self.result_label.setText("Could not save keyword: the category rule no longer exists.")
             return False
-        self.reload_transactions()
+        self.recategorize_transactions()
         self.result_label.setStyleSheet("color: #1f7a1f;")
         self.result_label.setText(f'Added "{keyword}" as a keyword for {category}; transactions were re-categorized.')
         return True
 
-    @staticmethod
-    def _reset_description_editor_position(editor):
-        """Show a newly created description editor from its first character."""
-        try:
-            editor.deselect()
-            editor.setCursorPosition(0)
-        except RuntimeError:
-            pass  # The table can delete an editor before the queued layout callback runs.
-
     def _schedule_rule_column_resize(self):
         QTimer.singleShot(0, self._resize_rule_columns)
 
@@ -558,7 +951,7 @@ class ExpenseWindow(QMainWindow):
         if hasattr(self, "rule_table"):
             self._schedule_rule_column_resize()
     def show_transaction_details(self, index):
-        row = self.transaction_model.frame.iloc[index.row()]
+        row = self.transaction_model.row(index.row())
         transaction_details_dialog(self, row).exec()
 
     def refresh_rules(self):
@@ -570,7 +963,7 @@ class ExpenseWindow(QMainWindow):
     def _keywords_saved(self, category):
         self.rule_status.setStyleSheet("color: #1f7a1f;")
         self.rule_status.setText(f"Keywords saved for {category}.")
-        QTimer.singleShot(0, self.reload_transactions)
+        QTimer.singleShot(0, self.recategorize_transactions)
 
     def _keywords_save_failed(self, message):
         self.rule_status.setStyleSheet("color: #a11;")
@@ -582,31 +975,26 @@ class ExpenseWindow(QMainWindow):
     def add_rule(self):
         category = self.rule_category.text().strip(); keywords = [k.strip().lower() for k in self.rule_keywords.text().split(",") if k.strip()]
         if not category or not keywords: return QMessageBox.warning(self, "Missing data", "Enter a category and at least one keyword.")
-        self.categorizer.add_rule(keywords, category); self.reload_transactions()
+        self.categorizer.add_rule(keywords, category); self.recategorize_transactions()
 
     def delete_rule(self):
         category = self.rule_category.text().strip()
-        if category: self.categorizer.delete_rule(category); self.reload_transactions()
+        if category: self.categorizer.delete_rule(category); self.recategorize_transactions()
 
     def restore_rules(self):
         success, message = self.categorizer.restore_latest_backup(); QMessageBox.information(self, "Restore rules", message)
-        if success: self.reload_transactions()
+        if success: self.recategorize_transactions()
 
     def import_rules_file(self):
         path, _ = QFileDialog.getOpenFileName(self, "Import rules", "", "JSON files (*.json)")
         if not path: return
         try:
-            self.categorizer.import_rules(json.loads(Path(path).read_text(encoding="utf-8"))); self.reload_transactions()
+            self.categorizer.import_rules(json.loads(Path(path).read_text(encoding="utf-8"))); self.recategorize_transactions()
         except (OSError, UnicodeDecodeError, json.JSONDecodeError, ValueError) as error: QMessageBox.critical(self, "Import failed", str(error))
 
     def refresh_statistics(self):
-        frame = self.store.dataframe
-        if frame.empty:
-            self.stats_model.set_frame(pd.DataFrame(columns=["Category", "Total spent (€)"]))
-        else:
-            expenses = frame[frame["amount"] < 0].copy(); expenses["amount"] = expenses["amount"].abs()
-            totals = expenses.groupby("category", as_index=False)["amount"].sum().sort_values("amount", ascending=False).rename(columns={"category": "Category", "amount": "Total spent (€)"})
-            self.stats_model.set_frame(totals)
+        spent = sorted(self.store.totals.spent_by_category.items(), key=lambda item: item[1], reverse=True)
+        self.stats_model.set_frame(pd.DataFrame(spent, columns=["Category", "Total spent (€)"]))
         self._refresh_export_category_selection()
 
     def _refresh_export_category_selection(self):
@@ -644,10 +1032,32 @@ class ExpenseWindow(QMainWindow):
         path, _ = QFileDialog.getSaveFileName(self, "Export yearly category report", "yearly_expense_report.xlsx", "Excel files (*.xlsx)")
         if not path:
             return
-        try:
-            write_yearly_statistics_export(path, expenses, categories, self.categorizer.rules)
-        except (OSError, ValueError) as error:
-            QMessageBox.critical(self, "Export failed", str(error))
+        # The worker gets its own copy of the rules; they can be edited while it writes.
+        self._export_worker = ExportWorker(path, expenses, categories, copy.deepcopy(self.categorizer.rules), self)
+        self._export_worker.progress.connect(self._show_export_progress)
+        self._export_worker.exported.connect(lambda path: self.export_status.setText(f"Exported the yearly report to {path}."))
+        self._export_worker.failed.connect(self._export_failed)
+        self._export_worker.finished.connect(self._export_finished)
+        self.export_button.setEnabled(False); self.cancel_export_button.setVisible(True)
+        self.export_status.setText(f"Exporting the yearly report to {path}…")
+        self._export_worker.start()
+
+    def cancel_export(self):
+        if self._export_worker is not None:
+            self._export_worker.requestInterruption()
+
+    def _show_export_progress(self, written, total):
+        self.export_status.setText(f"Exporting the yearly report: sheet {written} of {total} written…")
+
+    def _export_failed(self, message):
+        self.export_status.setText(f"Export failed: {message}")
+        QMessageBox.critical(self, "Export failed", message)
+
+    def _export_finished(self):
+        worker, self._export_worker = self._export_worker, None
+        worker.deleteLater(); self.export_button.setEnabled(True); self.cancel_export_button.setVisible(False)
+        if worker.cancelled:
+            self.export_status.setText("Export cancelled; no file was written.")
 
     def _set_category_checks(self, check_state):
         for checkbox in self.export_category_checkboxes:
@@ -655,6 +1065,8 @@ class ExpenseWindow(QMainWindow):
 
 
 def main():
+    # Frozen builds re-run this entry point in import worker processes.
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv); app.setApplicationName("Expense App Desktop")
     window = ExpenseWindow(); window.showMaximized(); return app.exec()
 
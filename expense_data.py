@@ -2,65 +2,543 @@
 
 from __future__ import annotations
 
+import multiprocessing
 import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
+from categorizer import FALLBACK_CATEGORY
+from search_index import SearchIndex
+from transaction_table import TransactionTable, statement_key
+
 
 REPORT_COLUMNS = [
     "File", "status", "rows_read", "imported_expenses", "skipped_non_expenses",
-    "skipped_missing_data", "skipped_excluded", "skipped_errors", "details",
+    "skipped_missing_data", "skipped_excluded", "skipped_errors", "skipped_invalid_dates", "skipped_duplicates",
+    "dialect", "date_format", "details",
 ]
 
 
+# Filtered and sorted row orders kept for the most recent table views.
+VIEW_CACHE_SIZE = 32
+
+# Starting worker processes costs more than parsing a couple of statements.
+MIN_FILES_PER_WORKER = 2
+
+# Rows read per batch when a statement is streamed into the store.
+IMPORT_BATCH_ROWS = 50_000
+
+
+def default_import_workers():
+    """Number of parser processes to use when importing many statements."""
+    return os.cpu_count() or 1
+
+
+def _parse_statement(parser, path):
+    """Process-pool entry point; must stay at module level so it can be pickled."""
+    return parser.parse_bank_statement_frame(path)
+
+
+class ColumnIndex:
+    """Row positions of every distinct value in one column, so filters cost the size of their result."""
+
+    def __init__(self, values):
+        codes, uniques = pd.factorize(values)
+        self.codes = codes
+        self._codes_by_value = {value: code for code, value in enumerate(uniques)}
+        order = np.argsort(codes, kind="stable")
+        # Missing values have code -1 and sort first; they belong to no value.
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        self._rows = [order[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+    def code(self, value):
+        return self._codes_by_value.get(value, -2)
+
+    def rows(self, value):
+        """Ascending row positions holding ``value``."""
+        code = self.code(value)
+        return self._rows[code] if code >= 0 else np.array([], dtype=np.intp)
+
+
+class ExpenseTotals:
+    """Running totals of the loaded transactions, updated by the rows that are added or removed.
+
+    Expenses are transactions with a negative amount; their spent amount is the absolute value.
+    Spending is kept per category, per ``YYYY-MM`` month and per year, and a key disappears
+    together with its last expense.
+    """
+
+    def __init__(self):
+        self.transactions = 0
+        self.categorized = 0
+        self.expenses = 0
+        self.spent = 0.0
+        self.spent_by_category: dict[str, float] = {}
+        self.spent_by_month: dict[str, float] = {}
+        self.spent_by_year: dict[int, float] = {}
+        self._category_expenses: dict[str, int] = {}
+        self._month_expenses: dict[str, int] = {}
+        self._year_expenses: dict[int, int] = {}
+
+    def add(self, statement, rows=None, sign=1):
+        """Count a statement's transactions, or only the given row positions of it."""
+        select = (lambda column: column) if rows is None else (lambda column: column[rows])
+        amounts, categories = select(statement.amounts), select(statement.category_codes)
+        self.transactions += sign * len(amounts)
+        self.categorized += sign * int((categories != statement.categories.find(FALLBACK_CATEGORY)).sum())
+        expense = amounts < 0
+        spent, categories, months = -amounts[expense], categories[expense], select(statement.month_codes)[expense]
+        if not len(spent):
+            return
+        self.expenses += sign * len(spent)
+        # Summing and subtracting floats drifts, so an empty total is reset to exactly zero.
+        self.spent = self.spent + sign * float(spent.sum()) if self.expenses else 0.0
+        for code, count, amount in self._group(categories, spent):
+            self._update(self.spent_by_category, self._category_expenses, statement.categories.values[code], amount, count * sign)
+        for code, count, amount in self._group(months, spent):
+            if code >= 0:
+                month = statement.months.values[code]
+                self._update(self.spent_by_month, self._month_expenses, month, amount, count * sign)
+                self._update(self.spent_by_year, self._year_expenses, int(month[:4]), amount, count * sign)
+
+    def remove(self, statement, rows=None):
+        self.add(statement, rows, sign=-1)
+
+    @staticmethod
+    def _group(codes, spent):
+        """``(code, count, spent)`` for every distinct code."""
+        uniques, inverse, counts = np.unique(codes, return_inverse=True, return_counts=True)
+        return zip(uniques.tolist(), counts.tolist(), np.bincount(inverse, weights=spent).tolist())
+
+    @staticmethod
+    def _update(spent, expenses, key, amount, count):
+        total = expenses.get(key, 0) + count
+        if total:
+            expenses[key] = total
+            spent[key] = spent.get(key, 0.0) + amount * (1 if count > 0 else -1)
+        else:
+            expenses.pop(key, None)
+            spent.pop(key, None)
+
+
 class ExpenseDataStore:
     """Keeps the imported transactions and applies the transaction-list filters."""
 
-    def __init__(self, scanner, parser, categorizer):
+    def __init__(self, scanner, parser, categorizer, database=None, workers=1):
         self.scanner = scanner
         self.parser = parser
         self.categorizer = categorizer
-        self.transactions: list[dict] = []
+        # TransactionDatabase holding every imported statement; without it nothing outlives the process.
+        self.database = database
+        # Statements that are not stored are parsed in up to this many processes.
+        self.workers = max(1, int(workers or 1))
+        self.transactions = TransactionTable()
         self.import_reports: list[dict] = []
         self.selected_files: list[str] = []
+        self._categorized_rules: list[tuple] = []
+        self.totals = ExpenseTotals()
+        # Transaction id -> block of the statement that imported it first.
+        self._transaction_owners: dict = {}
+        # (block, report) of a streamed statement whose last batch has not arrived yet.
+        self._pending_statement: tuple | None = None
+        # Statement path -> {id: category} assigned since take_unsaved_categories() was last called.
+        self._unsaved_categories: dict[str, dict] = {}
+        self._frame: pd.DataFrame | None = None
+        self._search_index: SearchIndex | None = None
+        self._column_indexes: dict[str, ColumnIndex] = {}
+        self._sort_keys: dict[tuple, np.ndarray] = {}
+        self._filtered_rows_cache: OrderedDict = OrderedDict()
+        self._sorted_rows_cache: OrderedDict = OrderedDict()
 
     def reload(self, selected_files=None):
+        self._import(self.begin_reload(selected_files))
+        return self.transactions
+
+    def begin_reload(self, selected_files=None):
+        """Drop the loaded data and return the ``(path, source)`` statements a reload imports, in order.
+
+        These are the scanned files, the selected files outside the scanned folder and every
+        statement kept in the database, also when its file no longer exists.
+        """
         if selected_files is not None:
             self.selected_files = [str(path) for path in selected_files]
 
-        self.transactions = []
+        self.transactions = TransactionTable()
         self.import_reports = []
-        scanned_files = self.scanner.scan_for_csvs()
-        self._load_files(scanned_files, "Scanned")
-        scanned_paths = {os.path.normcase(os.path.abspath(path)) for path in scanned_files}
-        imported_files = [
-            path for path in self.selected_files
-            if os.path.normcase(os.path.abspath(path)) not in scanned_paths
-        ]
-        self._load_files(imported_files, "Imported")
-        return self.transactions
+        self.totals = ExpenseTotals()
+        self._transaction_owners = {}
+        self._pending_statement = None
+        self._data_changed()
+        self._categorized_rules = self._rules_snapshot()
+        jobs = [(path, "Scanned") for path in self.scanner.scan_for_csvs()]
+        jobs += [(path, "Imported") for path in self.selected_files]
+        if self.database is not None:
+            jobs += self.database.statements()
+        # A file is imported once, from the first place that lists it.
+        statements = {}
+        for path, source in jobs:
+            statements.setdefault(os.path.normcase(os.path.abspath(str(path))), (path, source))
+        return list(statements.values())
+
+    def add_statement(self, path, source, frame, report, complete=True):
+        """Categorize one parsed statement and append its transactions and report.
+
+        Transactions whose id was already imported from another statement are dropped and
+        counted as ``skipped_duplicates``, so overlapping exports are not counted twice.
+        Repeated ids inside one statement are kept; they are separate identical payments.
+
+        A streamed statement arrives in batches: with ``complete=False`` the frame is one batch
+        and the report holds the running counts. Later batches of the same statement extend
+        its block, and the batch with ``complete=True`` carries the final report. A statement
+        that ends as 'Not imported' keeps no transactions.
+        """
+        name = os.path.basename(str(path))
+        if self._pending_statement is not None and self._pending_statement[0].key != statement_key(path, source):
+            self.discard_pending_statement()
+        pending, self._pending_statement = self._pending_statement, None
+        statement, stored_report = pending if pending is not None else (None, None)
+        failed = complete and report.get("status") == "Not imported"
+        ids = frame["id"].tolist() if "id" in frame else [None] * len(frame)
+        categories = self.categorizer.categorize_many(frame["description"].tolist())
+        stored_categories = frame["category"].tolist() if "category" in frame else [None] * len(frame)
+        # A streamed statement is only stored once it is complete; its categories are saved then.
+        if complete and statement is None and categories != stored_categories:
+            self._queue_categories(path, {
+                transaction_id: category
+                for transaction_id, category, stored in zip(ids, categories, stored_categories) if category != stored
+            })
 
-    def _load_files(self, paths, source):
-        for path in paths:
-            transactions, report = self.parser.parse_bank_statement_with_report(path)
-            report["File"] = os.path.basename(str(path))
+        owners = self._transaction_owners
+        keep = [transaction_id is None or owners.get(transaction_id, statement) is statement for transaction_id in ids]
+        duplicates = len(keep) - sum(keep)
+        if duplicates:
+            frame = frame[np.array(keep, dtype=bool)]
+            categories = [category for category, kept in zip(categories, keep) if kept]
+        if statement is None:
+            statement, rows = self.transactions.add(path, source, frame, categories), None
+            added_ids = statement.ids
+        else:
+            rows = self.transactions.extend(statement, frame, categories)
+            added_ids = statement.ids[rows]
+        owners.update(dict.fromkeys((transaction_id for transaction_id in added_ids if transaction_id is not None), statement))
+        self.totals.add(statement, rows)
+
+        report = dict(report)
+        report["File"] = name
+        report["source"] = source
+        report["path"] = str(path)
+        if stored_report is not None and not failed:
+            duplicates += stored_report["skipped_duplicates"]
+        report["skipped_duplicates"] = duplicates
+        if duplicates:
+            report["imported_expenses"] = report.get("imported_expenses", len(ids)) - duplicates
+        if stored_report is None:
             self.import_reports.append(report)
-            for transaction in transactions:
-                transaction = dict(transaction)
-                transaction["file"] = os.path.basename(str(path))
-                transaction["source"] = source
-                transaction["category"] = self.categorizer.suggest_category(transaction["description"])
-                self.transactions.append(transaction)
+        else:
+            self.import_reports = [report if entry is stored_report else entry for entry in self.import_reports]
+
+        if not complete:
+            self._pending_statement = (statement, report)
+        elif failed and len(statement):
+            # Reading failed partway through; the batches read before do not count.
+            self._drop_block(statement)
+        elif stored_report is not None:
+            self._queue_categories(path, dict(zip(statement.ids.tolist(), statement.category_names())))
+        self._data_changed()
+
+    def discard_pending_statement(self):
+        """Drop a streamed statement whose last batch will not arrive, e.g. because its import was cancelled."""
+        pending, self._pending_statement = self._pending_statement, None
+        if pending is None:
+            return False
+        statement, report = pending
+        self.import_reports = [entry for entry in self.import_reports if entry is not report]
+        self._drop_block(statement)
+        self._data_changed()
+        return True
+
+    def update_scanned_files(self, paths):
+        """Re-import only the given scanned statements: add new files and replace changed ones.
+
+        Unchanged files come straight from the database. A deleted file keeps its statement;
+        only ``remove_statements`` drops one. Returns the number of statements added or
+        replaced; all other statements keep their transactions untouched.
+        """
+        jobs, updated = self.begin_scanned_update(paths)
+        self._import(jobs)
+        return updated
+
+    def begin_scanned_update(self, paths):
+        """Drop the given scanned statements and return ``(jobs, updated)`` for importing them again.
+
+        ``jobs`` are the ``(path, source)`` statements to parse and add, in order: the files that
+        still exist and the statements whose duplicates a replaced file had covered. ``updated``
+        is the number of statements added or replaced.
+        """
+        paths = list(dict.fromkeys(str(path) for path in paths))
+        present = [path for path in paths if os.path.isfile(path)]
+        replaced = [path for path in present if self._remove_statement(path, "Scanned")]
+        # A file imported from elsewhere that now sits in the scanned folder is imported once, as scanned.
+        replaced += [path for path in present if self._remove_statement(path, "Imported")]
+        jobs = [(path, "Scanned") for path in present]
+        if replaced:
+            jobs += self._remove_dependent_statements()
+        return jobs, len(present)
+
+    def remove_statements(self, statements):
+        """Drop the given ``(path, source)`` statements, also from the database.
+
+        Returns the number of statements removed.
+        """
+        jobs, removed = self.begin_statement_removal(statements)
+        self._import(jobs)
+        return removed
+
+    def begin_statement_removal(self, statements):
+        """Drop the given statements for good and return ``(jobs, removed)`` for ``remove_statements``.
+
+        ``jobs`` are the statements to import again because rows they skipped as duplicates
+        have to come back. A removed file that still sits in the scanned folder returns with
+        the next reload.
+        """
+        removed = [(path, source) for path, source in statements if self._remove_statement(path, source)]
+        for path, _ in removed:
+            self._unsaved_categories.pop(str(path), None)
+            self._forget_statement(path)
+        removed_paths = {os.path.normcase(os.path.abspath(str(path))) for path, _ in removed}
+        self.selected_files = [
+            path for path in self.selected_files if os.path.normcase(os.path.abspath(path)) not in removed_paths
+        ]
+        return (self._remove_dependent_statements() if removed else []), len(removed)
+
+    def _remove_dependent_statements(self):
+        """Drop and return the statements with rows skipped as duplicates; a removed statement may have owned them."""
+        dependents = [
+            (report["path"], report["source"]) for report in self.import_reports if report.get("skipped_duplicates")
+        ]
+        for path, source in dependents:
+            self._remove_statement(path, source)
+        return dependents
+
+    def _import(self, jobs):
+        for (path, source), (frame, report) in zip(jobs, self.parse_statements(jobs)):
+            self.add_statement(path, source, frame, report)
+
+    def _remove_statement(self, path, source):
+        key = statement_key(path, source)
+        reports = [
+            report for report in self.import_reports
+            if statement_key(report["path"], report.get("source")) != key
+        ]
+        if len(reports) == len(self.import_reports):
+            return False
+        self.import_reports = reports
+        statement = self.transactions.statement(path, source)
+        if statement is not None:
+            self._drop_block(statement)
+        self._data_changed()
+        return True
+
+    def _drop_block(self, statement):
+        self.transactions.discard(statement)
+        owners = self._transaction_owners
+        for transaction_id in statement.ids.tolist():
+            if owners.get(transaction_id) is statement:
+                del owners[transaction_id]
+        self.totals.remove(statement)
+
+    def recategorize(self):
+        """Apply changed rules to the loaded transactions without parsing any statement again.
+
+        Rules are matched in order, so a transaction can only change category when it is
+        currently in the fallback category or in a category with a rule at or after the
+        first changed rule. All other transactions keep their category untouched.
+        """
+        previous, current = self._categorized_rules, self._rules_snapshot()
+        if previous == current:
+            return 0
+        first_change = next(
+            (index for index, (old, new) in enumerate(zip(previous, current)) if old != new),
+            min(len(previous), len(current)),
+        )
+        affected = {category for category, _ in previous[first_change:] + current[first_change:]}
+        affected.add(FALLBACK_CATEGORY)
+        labels = self.transactions.categories
+        affected_codes = [labels.find(category) for category in affected]
+
+        candidates, descriptions = [], []
+        for statement in self.transactions.statements:
+            rows = np.flatnonzero(np.isin(statement.category_codes, affected_codes))
+            if len(rows):
+                statement_descriptions = statement.descriptions()
+                candidates.append((statement, rows))
+                descriptions.extend(statement_descriptions[row] for row in rows.tolist())
+        categories = labels.codes(self.categorizer.categorize_many(descriptions))
+        changed, start = 0, 0
+        for statement, rows in candidates:
+            statement_categories, start = categories[start:start + len(rows)], start + len(rows)
+            moved = statement_categories != statement.category_codes[rows]
+            if moved.any():
+                rows = rows[moved]
+                self.totals.remove(statement, rows)
+                statement.category_codes[rows] = statement_categories[moved]
+                self.totals.add(statement, rows)
+                self._queue_categories(statement.path, dict(zip(statement.ids[rows].tolist(), statement.category_names(rows))))
+                changed += len(rows)
+        self._categorized_rules = current
+        if changed:
+            self._data_changed()
+        return changed
+
+    def take_unsaved_categories(self):
+        """Return and forget the categories assigned since the last call, for ``save_categories``."""
+        categories, self._unsaved_categories = self._unsaved_categories, {}
+        return categories
+
+    def save_categories(self, categories):
+        """Write categories from ``take_unsaved_categories`` to the database in one transaction.
+
+        Only touches the database, so it can run off the GUI thread.
+        """
+        if self.database is None or not categories:
+            return
+        try:
+            self.database.save_categories(categories)
+        except OSError as error:
+            print(error)
+
+    def _rules_snapshot(self):
+        return [(rule["category"], frozenset(rule["keywords"])) for rule in self.categorizer.rules]
+
+    def parse_statements(self, jobs):
+        """Yield ``(frame, report)`` for every ``(path, source)`` statement in order, parsing new or changed files in parallel.
+
+        Only reads the parser and the database, so it can run off the GUI thread. Closing the
+        generator early cancels statements that have not been parsed yet.
+        """
+        paths = [path for path, _ in jobs]
+        stored = [self._is_stored(path) for path in paths]
+        parsed = self._parse_files([path for path, is_stored in zip(paths, stored) if not is_stored])
+        try:
+            for (path, source), is_stored in zip(jobs, stored):
+                result = self._load_stored(path) if is_stored else None
+                if result is None:
+                    # A stored statement that cannot be read after all is parsed here.
+                    result = self.parser.parse_bank_statement_frame(path) if is_stored else next(parsed)
+                    self._save_statement(path, source, *result)
+                yield result
+        finally:
+            parsed.close()
+
+    def parse_statement_batches(self, jobs):
+        """Yield ``(position, frame, report, complete)`` for every ``(path, source)`` statement in order, for ``add_statement``.
+
+        Statements parsed in this thread are streamed, so the first transactions of a huge file
+        are available while the rest is still read: every batch comes with a snapshot of the
+        running report, and a final empty batch with ``complete`` set carries the finished one.
+        Stored statements and statements parsed in worker processes arrive as one complete
+        batch; stored ones are read from the database only when their turn comes, so the first
+        rows show before the whole database is read. Like ``parse_statements`` this can run off
+        the GUI thread.
+        """
+        paths = [path for path, _ in jobs]
+        stored = [self._is_stored(path) for path in paths]
+        new_paths = [path for path, is_stored in zip(paths, stored) if not is_stored]
+        parallel = self._parse_workers(len(new_paths)) >= 2
+        parsed = self._parse_files(new_paths if parallel else [])
+        try:
+            for position, ((path, source), is_stored) in enumerate(zip(jobs, stored)):
+                result = self._load_stored(path) if is_stored else None
+                if result is None and parallel and not is_stored:
+                    result = next(parsed)
+                    self._save_statement(path, source, *result)
+                if result is not None:
+                    yield position, result[0], result[1], True
+                    continue
+                report, frames = self.parser.new_report(), []
+                for frame in self.parser.stream_bank_statement(path, report, IMPORT_BATCH_ROWS):
+                    frames.append(frame)
+                    yield position, frame, dict(report), False
+                frame = self.parser.combine_batches(frames, report)
+                self._save_statement(path, source, frame, report)
+                yield position, frame.iloc[:0], report, True
+        finally:
+            parsed.close()
+
+    def _is_stored(self, path):
+        return self.database is not None and self.database.is_current(path)
+
+    def _load_stored(self, path):
+        return self.database.load(path) if self.database is not None else None
+
+    def _parse_workers(self, count):
+        return min(self.workers, count // MIN_FILES_PER_WORKER)
+
+    def _parse_files(self, paths):
+        workers = self._parse_workers(len(paths))
+        if workers < 2:
+            for path in paths:
+                yield self.parser.parse_bank_statement_frame(path)
+            return
+        # Spawned workers do not inherit the GUI process's Qt state or threads.
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        chunksize = max(1, len(paths) // (workers * 4))
+        parsed = 0
+        try:
+            for result in executor.map(_parse_statement, [self.parser] * len(paths), paths, chunksize=chunksize):
+                yield result
+                parsed += 1
+        except BrokenProcessPool as error:
+            print(f"Parallel import failed, parsing statements one by one: {error}")
+            for path in paths[parsed:]:
+                yield self.parser.parse_bank_statement_frame(path)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _queue_categories(self, path, categories):
+        if self.database is not None and categories:
+            self._unsaved_categories.setdefault(str(path), {}).update(categories)
+
+    def _forget_statement(self, path):
+        if self.database is None:
+            return
+        try:
+            self.database.remove(path)
+        except OSError as error:
+            print(f"Could not remove stored statement {path}: {error}")
+
+    def _save_statement(self, path, source, frame, report):
+        if self.database is None:
+            return
+        try:
+            self.database.save(path, source, frame, report)
+        except OSError as error:
+            print(f"Could not store parsed statement {path}: {error}")
+
+    def _data_changed(self):
+        """Drop everything derived from the transactions; it is rebuilt on next use."""
+        self._frame = None
+        self._search_index = None
+        self._column_indexes = {}
+        self._sort_keys = {}
+        self._filtered_rows_cache.clear()
+        self._sorted_rows_cache.clear()
 
     @property
     def dataframe(self):
-        if not self.transactions:
-            return pd.DataFrame(columns=["date", "description", "amount", "category", "file", "source"])
-        frame = pd.DataFrame(self.transactions).copy()
-        frame["date"] = pd.to_datetime(frame["date"], dayfirst=True, format="mixed")
-        frame["Month"] = frame["date"].dt.strftime("%Y-%m")
-        return frame
+        """Typed transaction frame, built once per data change and shared by all views."""
+        if self._frame is None:
+            self._frame = self._build_frame()
+        # A shallow copy keeps callers from adding columns to the shared frame.
+        return self._frame.copy(deep=False)
+
+    def _build_frame(self):
+        return self.transactions.to_frame()
 
     def months(self):
         frame = self.dataframe
@@ -68,16 +546,105 @@ class ExpenseDataStore:
 
     def filtered(self, category="All", month="All", query=""):
         frame = self.dataframe
-        if category != "All":
-            frame = frame[frame["category"] == category]
-        if month != "All":
-            frame = frame[frame["Month"] == month]
-        query = query.strip()
-        if query:
-            frame = frame[frame["description"].astype(str).str.contains(
-                query, case=False, regex=False, na=False
-            )]
-        return frame
+        rows = self._filtered_rows(category, month, query)
+        return frame if rows is None else frame.take(rows)
+
+    def page(self, category="All", month="All", query="", sort_column="date", descending=True, page=1, page_size=20):
+        """Return one page of the filtered, sorted transactions and the number of matching transactions.
+
+        Sorting is stable with missing values last, like ``sort_values(kind="stable")``. The full
+        sorted order is stored per filter and sort, so later pages are plain slices; a first page
+        that is not stored yet only selects its top rows.
+        """
+        rows = self._filtered_rows(category, month, query)
+        if rows is None:
+            rows = np.arange(len(self.dataframe))
+        start = (max(1, page) - 1) * page_size
+        key = (category, month, tuple(query.casefold().split()), sort_column, descending)
+        ordered = self._cache_get(self._sorted_rows_cache, key)
+        if ordered is None:
+            keys = self._sort_key(sort_column, descending)[rows]
+            if start == 0 and page_size < len(rows):
+                return self.dataframe.take(rows[self._first_positions(keys, page_size)]), len(rows)
+            ordered = rows[np.argsort(keys, kind="stable")]
+            self._cache_put(self._sorted_rows_cache, key, ordered)
+        return self.dataframe.take(ordered[start:start + page_size]), len(rows)
+
+    @staticmethod
+    def _first_positions(keys, count):
+        """Positions of the ``count`` smallest keys in stable order, without sorting all keys."""
+        threshold = np.partition(keys, count - 1)[count - 1]
+        candidates = np.flatnonzero(keys <= threshold)
+        return candidates[np.argsort(keys[candidates], kind="stable")][:count]
+
+    def _sort_key(self, column, descending):
+        """Integer sort ranks of a column; ascending ranks order like the column, missing values last."""
+        key = self._sort_keys.get((column, descending))
+        if key is None:
+            values = self.dataframe[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                codes = values.cat.codes.to_numpy()
+            else:
+                codes, _ = pd.factorize(values, sort=True)
+            key = codes.astype(np.int64)
+            if descending:
+                key = -key
+            key[values.isna().to_numpy()] = np.iinfo(np.int64).max
+            self._sort_keys[(column, descending)] = key
+        return key
+
+    def _filtered_rows(self, category, month, query):
+        """Ascending row positions matching the filters, or ``None`` when nothing is filtered."""
+        key = (category, month, tuple(query.casefold().split()))
+        if key == ("All", "All", ()):
+            return None
+        rows = self._cache_get(self._filtered_rows_cache, key)
+        if rows is not None:
+            return rows
+        filters = [
+            (self._column_index(column), value)
+            for column, value in (("category", category), ("Month", month)) if value != "All"
+        ]
+        if filters:
+            # Start from the smaller row set and check the other column's codes on it only.
+            filters.sort(key=lambda item: len(item[0].rows(item[1])))
+            index, value = filters[0]
+            rows = index.rows(value)
+            for index, value in filters[1:]:
+                rows = rows[index.codes[rows] == index.code(value)]
+        if query.strip():
+            if rows is None:
+                rows = np.flatnonzero(self.search_index.matches(query))
+            else:
+                rows = rows[self.search_index.matches(query, rows)]
+        self._cache_put(self._filtered_rows_cache, key, rows)
+        return rows
+
+    @staticmethod
+    def _cache_get(cache, key):
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+    @staticmethod
+    def _cache_put(cache, key, value):
+        cache[key] = value
+        if len(cache) > VIEW_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    def _column_index(self, column):
+        """Per-value row positions of a frame column, built once per data change."""
+        if column not in self._column_indexes:
+            self._column_indexes[column] = ColumnIndex(self.dataframe[column])
+        return self._column_indexes[column]
+
+    @property
+    def search_index(self):
+        """Description search index, built on the first search after a data change."""
+        if self._search_index is None:
+            self._search_index = SearchIndex(self.dataframe["description"])
+        return self._search_index
 
     def reports_dataframe(self):
         if not self.import_reports:
@@ -0,0 +1,32 @@
+"""Fingerprints of parsed bank statements, telling whether a stored parse is still up to date."""
+
+import hashlib
+import os
+
+
+# Bump whenever the parser output changes so that stored statements are parsed again.
+CACHE_VERSION = 2
+
+
+def file_sha256(path):
+    """Return the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path):
+    """Return the ``(size, mtime_ns, sha256)`` to store with a statement parsed from ``path``."""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns, file_sha256(path)
+
+
+def is_unchanged(path, stat, fingerprint):
+    """Tell whether the file at ``path``, with its current ``stat``, still has the stored fingerprint."""
+    size, mtime_ns, sha256 = fingerprint
+    if size != stat.st_size:
+        return False
+    # A touched file may still be unchanged; only its content hash can tell.
+    return mtime_ns == stat.st_mtime_ns or file_sha256(path) == sha256
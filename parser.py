@@ -1,6 +1,56 @@
-import pandas as pd
+import codecs
+import csv
 import hashlib
+import itertools
 import os
+import re
+
+import numpy as np
+import pandas as pd
+
+# Bytes read once from the start of a statement to work out how to parse it.
+SNIFF_SIZE = 64 * 1024
+# Statement files larger than this are memory-mapped and parsed LARGE_FILE_CHUNK_ROWS rows at a time.
+LARGE_FILE_SIZE = 64 * 1024 * 1024
+LARGE_FILE_CHUNK_ROWS = 50_000
+SEPARATORS = [';', ',']
+ENCODINGS = ['utf-8', 'latin-1', 'cp1252']
+AMOUNT_COLUMNS = ['Amount', 'Betrag', 'amount', 'Wert']
+EASYBANK_COLUMNS = [
+    'Kontonummer', 'Buchungstext', 'Buchungsdatum',
+    'Valutadatum', 'Betrag', 'Währung'
+]
+EASYBANK_AMOUNT = re.compile(r'^[-+]?[\d.,]+$')
+EASYBANK_CURRENCY = re.compile(r'^[A-Z]{3}$')
+TRANSACTION_COLUMNS = ['id', 'date', 'month', 'description', 'amount', 'category']
+# Date formats tried on each file, day-first layouts before month-first ones.
+DATE_FORMATS = [
+    '%d.%m.%Y', '%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y', '%d.%m.%y', '%Y/%m/%d',
+    '%m/%d/%Y', '%d.%m.%Y %H:%M:%S', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S',
+]
+DATE_SAMPLE_SIZE = 50
+DESCRIPTION_COLUMNS = ['Description', 'Name', 'Item Title', 'Type', 'Buchungstext', 'Verwendungszweck']
+# Accepted header names for each column the parser needs, in order of preference.
+COLUMN_OPTIONS = {
+    'Date': ['Buchungsdatum', 'Datum', 'Date'],
+    'Description': ['Buchungstext', 'Verwendungszweck', 'Description', 'Name', 'Item Title'],
+    'Amount': ['Betrag', 'Amount', 'Wert', 'Total'],
+    'TxID': ['Transaction ID', 'Referenz', 'id'],
+    'Type': ['Type', 'Status']
+}
+# Large files are read with only these columns; exports such as PayPal's have dozens more.
+USED_COLUMNS = {column for options in COLUMN_OPTIONS.values() for column in options}.union(DESCRIPTION_COLUMNS)
+EXCLUDED_DESCRIPTIONS = ["General Currency Conversion", "General Authorization", "User Initiated Withdrawal"]
+# Text values that str(value).lower() turns into 'nan' are treated as empty.
+NAN_TEXTS = ['nan', 'naN', 'nAn', 'nAN', 'Nan', 'NaN', 'NAn', 'NAN']
+EXCLUDED_PATTERN = '|'.join(re.escape(text) for text in EXCLUDED_DESCRIPTIONS)
+# Exact powers of ten for turning parsed digits into amounts.
+DECIMAL_POWERS = np.array([float(10 ** exponent) for exponent in range(16)])
+
+
+class CsvReadError(Exception):
+    """A statement could not be read with the dialect sniffed from its first bytes."""
+
 
 class Parser:
     @staticmethod
@@ -15,100 +65,265 @@ class Parser:
     @staticmethod
     def parse_bank_statement_with_report(file_input):
         """Parse a statement and return both transactions and an import report."""
-        report = {
+        frame, report = Parser.parse_bank_statement_frame(file_input)
+        return frame.to_dict('records'), report
+
+    @staticmethod
+    def parse_bank_statement_frame(file_input):
+        """Parse a statement into a transaction DataFrame and an import report."""
+        report = Parser.new_report()
+        frames = list(Parser.stream_bank_statement(file_input, report, chunk_rows=None))
+        return Parser.combine_batches(frames, report), report
+
+    @staticmethod
+    def new_report():
+        """Return an empty import report for ``stream_bank_statement`` to fill in."""
+        return {
             'rows_read': 0,
             'imported_expenses': 0,
             'skipped_non_expenses': 0,
             'skipped_missing_data': 0,
             'skipped_excluded': 0,
             'skipped_errors': 0,
-            'status': 'Imported',
+            'skipped_invalid_dates': 0,
+            'status': 'Importing',
+            'dialect': '',
+            'date_format': '',
             'details': '',
         }
 
-        df = Parser._load_csv(file_input)
-        if df is None:
-            report['status'] = 'Not imported'
-            report['details'] = 'Could not read a supported CSV format or find an amount column.'
-            return [], report
+    @staticmethod
+    def stream_bank_statement(file_input, report, chunk_rows=LARGE_FILE_CHUNK_ROWS):
+        """Yield a statement's transactions as frames of at most ``chunk_rows`` read rows while the file is read.
+
+        ``report`` (see ``new_report``) is updated before each frame is yielded, so its counters
+        can be read at any point. Its status stays 'Importing' until the generator is exhausted.
+        A statement that cannot be read, even partway through, ends as 'Not imported'; frames
+        yielded before that are not part of the import. With ``chunk_rows=None`` only large
+        files are split.
+        """
+        report['status'] = 'Importing'
+        chunks, dialect = Parser._load_csv(file_input, chunk_rows)
+        if chunks is None:
+            Parser._not_imported(report, 'Could not read a supported CSV format or find an amount column.')
+            return
+
+        report['dialect'] = Parser._describe_dialect(dialect)
+        final_cols = date_format = chunk_format = None
+        while True:
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                break
+            except UnicodeDecodeError:
+                # A byte after the rows read so far is not valid UTF-8; latin-1 accepts every byte.
+                dialect['encoding'] = 'latin-1'
+                report['dialect'] = Parser._describe_dialect(dialect)
+                chunks = Parser._skip_rows(Parser._read_chunks(file_input, dialect, chunk_rows), report['rows_read'])
+                continue
+            except CsvReadError as error:
+                print(f"Failed to read CSV after {report['rows_read']} rows: {error}")
+                Parser._not_imported(report, f"Reading stopped after {report['rows_read']} rows: {error}")
+                return
+
+            if final_cols is None:
+                final_cols = Parser._map_columns(chunk)
+                if not final_cols:
+                    Parser._not_imported(report, 'Required columns are missing (date, description, or amount).')
+                    return
+            # The format found in the first chunk with dates is kept, so a file is read with one format.
+            frame, summary = Parser._extract_frame(chunk, final_cols, date_format)
+            chunk_format = summary.pop('date_format')
+            if date_format is None and (len(frame) or summary['skipped_invalid_dates']):
+                date_format = chunk_format
+            report['date_format'] = date_format or chunk_format
+            report['rows_read'] += len(chunk)
+            report['imported_expenses'] += len(frame)
+            for key, value in summary.items():
+                report[key] += value
+            yield frame
+
+        report['status'] = 'Imported'
+
+    @staticmethod
+    def combine_batches(frames, report):
+        """Join the frames of a finished ``stream_bank_statement`` into the statement's transaction frame."""
+        if report['status'] == 'Not imported' or not frames:
+            return pd.DataFrame(columns=TRANSACTION_COLUMNS)
+        return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+    @staticmethod
+    def _not_imported(report, details):
+        report['status'] = 'Not imported'
+        report['details'] = details
+        report['imported_expenses'] = 0
+
+    @staticmethod
+    def _load_csv(file_input, chunk_rows=None):
+        """Sniff the CSV dialect from a small prefix and start reading the file once.
+
+        Returns an iterator over the rows as frames: one frame, or chunks of a large file.
+        """
+        dialect = Parser._sniff_csv(file_input)
+        if dialect is None:
+            print("Failed to parse CSV with standard separators and encodings.")
+            return None, None
+
+        try:
+            chunks = Parser._read_chunks(file_input, dialect, chunk_rows)
+            first = next(chunks, None)
+        except UnicodeDecodeError:
+            # The prefix decoded as UTF-8 but a later byte did not; latin-1 accepts every byte.
+            dialect['encoding'] = 'latin-1'
+            try:
+                chunks = Parser._read_chunks(file_input, dialect, chunk_rows)
+                first = next(chunks, None)
+            except (CsvReadError, UnicodeDecodeError):
+                first = None
+        except CsvReadError:
+            first = None
+
+        if first is None:
+            print("Failed to parse CSV with standard separators and encodings.")
+            return None, None
+
+        if dialect['header'] is None:
+            print(f"Successfully loaded headerless EASYBANK CSV with encoding='{dialect['encoding']}'")
+        else:
+            print(f"Successfully loaded CSV with separator='{dialect['sep']}' and encoding='{dialect['encoding']}'")
+        return itertools.chain([first], chunks), dialect
+
+    @staticmethod
+    def _read_chunks(file_input, dialect, chunk_rows=None):
+        """Yield the statement in chunks of ``chunk_rows`` rows, or as one frame when it is ``None``.
+
+        Large files are always read in chunks, memory-mapped and with only the columns the
+        parser uses, so the raw text and the full table are never held in memory at once.
+        Decoding errors are raised as they are; every other reading error is raised as
+        ``CsvReadError``.
+        """
+        large = Parser._is_large_file(file_input)
+        try:
+            if chunk_rows is None and not large:
+                yield Parser._read_csv(file_input, dialect)
+                return
+            options = {'memory_map': True, 'usecols': lambda column: column in USED_COLUMNS} if large else {}
+            with Parser._read_csv(file_input, dialect, chunksize=chunk_rows or LARGE_FILE_CHUNK_ROWS, **options) as reader:
+                yield from reader
+        except UnicodeDecodeError:
+            raise
+        except Exception as error:
+            raise CsvReadError(str(error).strip()) from error
+
+    @staticmethod
+    def _skip_rows(chunks, count):
+        """Drop the first ``count`` rows of a chunk stream; they were already read with another encoding."""
+        for chunk in chunks:
+            if count >= len(chunk):
+                count -= len(chunk)
+                continue
+            yield chunk.iloc[count:] if count else chunk
+            count = 0
+
+    @staticmethod
+    def _is_large_file(file_input):
+        if not isinstance(file_input, (str, os.PathLike)):
+            return False
+        try:
+            return os.path.getsize(file_input) > LARGE_FILE_SIZE
+        except OSError:
+            return False
 
-        report['rows_read'] = len(df)
+    @staticmethod
+    def _read_csv(file_input, dialect, **options):
+        if hasattr(file_input, 'seek'):
+            file_input.seek(0)
 
-        final_cols = Parser._map_columns(df)
-        if not final_cols:
-            report['status'] = 'Not imported'
-            report['details'] = 'Required columns are missing (date, description, or amount).'
-            return [], report
+        if dialect['header'] is None:
+            options.update(header=None, names=EASYBANK_COLUMNS)
+        return pd.read_csv(file_input, sep=dialect['sep'], encoding=dialect['encoding'], **options)
 
-        transactions, skipped = Parser._extract_transactions(df, final_cols, include_report=True)
-        report['imported_expenses'] = len(transactions)
-        report.update(skipped)
-        return transactions, report
+    @staticmethod
+    def _read_prefix(file_input):
+        """Return the first SNIFF_SIZE bytes (or characters for text streams) of the input."""
+        if isinstance(file_input, (str, os.PathLike)):
+            with open(file_input, 'rb') as handle:
+                return handle.read(SNIFF_SIZE)
+
+        if hasattr(file_input, 'seek'):
+            file_input.seek(0)
+        prefix = file_input.read(SNIFF_SIZE)
+        if hasattr(file_input, 'seek'):
+            file_input.seek(0)
+        return prefix
 
     @staticmethod
-    def _load_csv(file_input):
-        easybank_columns = [
-            'Kontonummer', 'Buchungstext', 'Buchungsdatum',
-            'Valutadatum', 'Betrag', 'Währung'
-        ]
+    def _decode_prefix(prefix):
+        """Decode a byte prefix with the first supported encoding that accepts it."""
+        for enc in ENCODINGS:
+            try:
+                # The prefix may end inside a multi-byte character, so do not treat it as final.
+                return codecs.getincrementaldecoder(enc)().decode(prefix, final=False), enc
+            except UnicodeDecodeError:
+                continue
+        return None, None
+
+    @staticmethod
+    def _sniff_csv(file_input):
+        """Work out separator, encoding, header row and amount column from the file prefix."""
+        try:
+            prefix = Parser._read_prefix(file_input)
+        except Exception:
+            return None
+        if isinstance(prefix, bytes):
+            text, encoding = Parser._decode_prefix(prefix)
+        elif isinstance(prefix, str):
+            text, encoding = prefix, ENCODINGS[0]
+        else:
+            return None
+        if text is None:
+            return None
+
+        lines = [line for line in text.lstrip('\ufeff').splitlines() if line.strip()]
+        if not lines:
+            return None
+        first_line = lines[0]
 
         # EASYBANK exports may contain transaction rows without a header row.
-        # Identify them by filename and supply the bank's fixed column layout.
+        # Identify them by filename or by their fixed layout and supply the bank's columns.
         file_name = os.path.basename(
             str(file_input if isinstance(file_input, (str, os.PathLike))
                 else getattr(file_input, 'name', ''))
         )
-        if file_name.upper().startswith('EASYBANK'):
-            for enc in ['utf-8', 'latin-1', 'cp1252']:
-                try:
-                    if hasattr(file_input, 'seek'):
-                        file_input.seek(0)
-
-                    df = pd.read_csv(
-                        file_input,
-                        sep=';',
-                        encoding=enc,
-                        header=None,
-                        names=easybank_columns,
-                    )
-                    print(f"Successfully loaded headerless EASYBANK CSV with encoding='{enc}'")
-                    return df
-                except Exception:
-                    continue
-
-        separators = [';', ',']
-        encodings = ['utf-8', 'latin-1', 'cp1252']
-        possible_amount_cols = ['Amount', 'Betrag', 'amount', 'Wert']
-
-        for sep in separators:
-            for enc in encodings:
-                try:
-                    if hasattr(file_input, 'seek'):
-                        file_input.seek(0)
-
-                    df = pd.read_csv(file_input, sep=sep, encoding=enc)
-
-                    if any(col in df.columns for col in possible_amount_cols):
-                        print(f"Successfully loaded CSV with separator='{sep}' and encoding='{enc}'")
-                        return df
-                except Exception:
-                    continue
-
-        print("Failed to parse CSV with standard separators and encodings.")
+        if file_name.upper().startswith('EASYBANK') or Parser._looks_like_easybank_row(first_line):
+            return {'sep': ';', 'encoding': encoding, 'header': None, 'amount_column': 'Betrag'}
+
+        for sep in SEPARATORS:
+            header = next(csv.reader([first_line], delimiter=sep))
+            amount_column = next((col for col in AMOUNT_COLUMNS if col in header), None)
+            if amount_column:
+                return {'sep': sep, 'encoding': encoding, 'header': 0, 'amount_column': amount_column}
         return None
 
+    @staticmethod
+    def _looks_like_easybank_row(line):
+        fields = next(csv.reader([line], delimiter=';'))
+        return (
+            len(fields) == len(EASYBANK_COLUMNS)
+            and bool(EASYBANK_AMOUNT.match(fields[4].strip()))
+            and bool(EASYBANK_CURRENCY.match(fields[5].strip()))
+        )
+
+    @staticmethod
+    def _describe_dialect(dialect):
+        layout = 'headerless EASYBANK layout' if dialect['header'] is None else 'header row'
+        return (f"separator '{dialect['sep']}', encoding {dialect['encoding']}, {layout}, "
+                f"amount column '{dialect['amount_column']}'")
+
     @staticmethod
     def _map_columns(df):
-        col_map = {
-            'Date': ['Buchungsdatum', 'Datum', 'Date'],
-            'Description': ['Buchungstext', 'Verwendungszweck', 'Description', 'Name', 'Item Title'],
-            'Amount': ['Betrag', 'Amount', 'Wert', 'Total'],
-            'TxID': ['Transaction ID', 'Referenz', 'id'],
-            'Type': ['Type', 'Status']
-        }
-        
         final_cols = {}
-        for target, options in col_map.items():
+        for target, options in COLUMN_OPTIONS.items():
             for opt in options:
                 if opt in df.columns:
                     final_cols[target] = opt
@@ -166,71 +381,192 @@ class Parser:
             return 0.0
 
     @staticmethod
-    def _extract_transactions(df, final_cols, include_report=False):
-        amount_idx = df.columns.get_loc(final_cols['Amount'])
-        date_idx = df.columns.get_loc(final_cols['Date'])
-        txid_col = final_cols.get('TxID')
-        txid_idx = df.columns.get_loc(txid_col) if txid_col else None
+    def _parse_amounts(values):
+        """
+        Parses a whole amount column at once with the same rules as `_parse_amount`.
+        Text is handled as a matrix of code points so that every step runs in NumPy.
+        """
+        values = pd.Series(values)
+        if pd.api.types.is_numeric_dtype(values):
+            return values.astype(float).fillna(0.0).to_numpy()
+        if not pd.api.types.is_string_dtype(values):
+            # Mixed object columns are rare; keep them on the scalar path.
+            return values.map(Parser._parse_amount).to_numpy(dtype=float)
 
-        potential_desc_cols = ['Description', 'Name', 'Item Title', 'Type', 'Buchungstext', 'Verwendungszweck']
-        desc_col_indices = [df.columns.get_loc(col) for col in potential_desc_cols if col in df.columns]
+        amounts = np.zeros(len(values))
+        present = np.flatnonzero(values.notna().to_numpy())
+        text = values.iloc[present].to_numpy(dtype=str)
+        if not text.size or not text.dtype.itemsize:
+            return amounts
+        # Column-major layout keeps the per-row reductions below contiguous.
+        codes = np.asfortranarray(text.view(np.uint32).reshape(len(text), -1))
 
-        transactions = []
-        skipped = {
-            'skipped_non_expenses': 0,
-            'skipped_missing_data': 0,
+        # str.isdigit also accepts non-ASCII digits; leave those rows to the scalar parser.
+        non_ascii = (codes > 127).any(axis=1)
+        for row in np.flatnonzero(non_ascii):
+            amounts[present[row]] = Parser._parse_amount(text[row])
+
+        position = np.arange(codes.shape[1])
+        whitespace = (codes == 0) | ((codes >= 9) & (codes <= 13)) | ((codes >= 28) & (codes <= 32))
+        stripped_end = np.where(whitespace, 0, position + 1).max(axis=1)
+        is_dot, is_comma = codes == ord('.'), codes == ord(',')
+        last_dot = np.where(is_dot, position, -1).max(axis=1)
+        last_comma = np.where(is_comma, position, -1).max(axis=1)
+        has_dot, has_comma = last_dot >= 0, last_comma >= 0
+
+        # Both separators: the later one is the decimal separator (1,234.56 or 1.234,56).
+        us_format = has_dot & has_comma & (last_dot > last_comma)
+        eu_format = has_dot & has_comma & ~us_format
+        # Only commas: a single comma followed by two characters is a decimal comma.
+        decimal_comma = (has_comma & ~has_dot & (is_comma.sum(axis=1) == 1)
+                         & (stripped_end - last_comma == 3))
+        thousands_comma = has_comma & ~has_dot & ~decimal_comma
+
+        dropped = (eu_format[:, None] & is_dot) | ((us_format | thousands_comma)[:, None] & is_comma)
+        codes = np.where((eu_format | decimal_comma)[:, None] & is_comma, ord('.'), codes)
+        is_digit = (codes >= ord('0')) & (codes <= ord('9'))
+        is_dot, is_minus = codes == ord('.'), codes == ord('-')
+        keep = (is_digit | is_dot | is_minus) & ~dropped
+
+        # Accept exactly what float() accepts after filtering: -?digits[.digits], at least one digit.
+        digit = is_digit & keep
+        rank = np.cumsum(keep, axis=1) - 1
+        valid = (
+            ~non_ascii
+            & digit.any(axis=1)
+            & ((is_dot & keep).sum(axis=1) <= 1)
+            & ~(is_minus & keep & (rank > 0)).any(axis=1)
+        )
+
+        # With at most 15 digits the mantissa and the power of ten are exact doubles, so one
+        # IEEE division gives the same correctly rounded value as float() on the cleaned text.
+        exact = valid & (digit.sum(axis=1) <= 15)
+        mantissa = np.zeros(len(codes), dtype=np.int64)
+        for column in range(codes.shape[1]):
+            mantissa = np.where(digit[:, column], mantissa * 10 + (codes[:, column] - ord('0')), mantissa)
+        decimals = (digit & (np.cumsum(is_dot & keep, axis=1) > 0)).sum(axis=1)
+        parsed = mantissa[exact] / DECIMAL_POWERS[decimals[exact]]
+        negative = (is_minus & keep).any(axis=1)[exact]
+        amounts[present[exact]] = np.where(negative, -parsed, parsed)
+
+        for row in np.flatnonzero(valid & ~exact):
+            amounts[present[row]] = Parser._parse_amount(text[row])
+        return amounts
+
+    @staticmethod
+    def _extract_frame(df, final_cols, date_format=None):
+        """Select expense rows, parse their dates and build ids and descriptions column by column.
+
+        ``date_format`` is the reported format of an earlier chunk of the same file; without it
+        the format is detected from these rows.
+        """
+        amount_values = df.iloc[:, df.columns.get_loc(final_cols['Amount'])]
+        date_values = df.iloc[:, df.columns.get_loc(final_cols['Date'])]
+        txid_col = final_cols.get('TxID')
+
+        missing = (amount_values.isna() | date_values.isna()).to_numpy()
+        amounts = Parser._parse_amounts(amount_values)
+        # Only import expenses. Bank statements use negative amounts for outgoing payments.
+        expense = ~missing & ~(amounts >= 0)
+        summary = {
+            'skipped_non_expenses': int((~missing & (amounts >= 0)).sum()),
+            'skipped_missing_data': int(missing.sum()),
             'skipped_excluded': 0,
+            # Kept for the report layout; whole-column extraction has no per-row failures.
             'skipped_errors': 0,
+            'skipped_invalid_dates': 0,
         }
-        for row in df.itertuples(index=False, name=None):
-            try:
-                if pd.isna(row[amount_idx]) or pd.isna(row[date_idx]):
-                    skipped['skipped_missing_data'] += 1
-                    continue
 
-                amount = Parser._parse_amount(row[amount_idx])
-                # Only import expenses. Bank statements use negative amounts for outgoing payments.
-                if amount >= 0:
-                    skipped['skipped_non_expenses'] += 1
-                    continue
+        rows = df[expense]
+        descriptions = Parser._join_descriptions(rows)
+        excluded = descriptions.str.contains(EXCLUDED_PATTERN, regex=True).to_numpy(dtype=bool)
+        summary['skipped_excluded'] = int(excluded.sum())
 
-                date_str = str(row[date_idx])
-                
-                desc_parts = []
-                for idx in desc_col_indices:
-                    val_raw = row[idx]
-                    if not pd.isna(val_raw):
-                        val = str(val_raw).strip()
-                        if val and val.lower() != 'nan' and val not in desc_parts:
-                            desc_parts.append(val)
-                
-                desc_str = " - ".join(desc_parts) if desc_parts else "Unknown Transaction"
-                
-                exclusions = ["General Currency Conversion", "General Authorization", "User Initiated Withdrawal"]
-                if any(ex in desc_str for ex in exclusions):
-                    skipped['skipped_excluded'] += 1
-                    continue
-                
-                tx_unique_id = str(row[txid_idx]) if txid_idx is not None and not pd.isna(row[txid_idx]) else None
-                
-                if tx_unique_id:
-                    hash_input = tx_unique_id.encode('utf-8')
-                else:
-                    hash_input = f"{date_str}{desc_str}{amount}".encode('utf-8')
-                
-                tx_id = hashlib.sha256(hash_input).hexdigest()[:10]
-                
-                transactions.append({
-                    'id': tx_id,
-                    'date': date_str,
-                    'description': desc_str[:150],
-                    'amount': amount,
-                    'category': None
-                })
-            except Exception as row_error:
-                print(f"Skipping row due to error: {row_error}")
-                skipped['skipped_errors'] += 1
-                
-        if include_report:
-            return transactions, skipped
-        return transactions
+        rows, descriptions = rows[~excluded], descriptions[~excluded]
+        amounts = amounts[expense][~excluded]
+        dates = rows.iloc[:, df.columns.get_loc(final_cols['Date'])].astype(str)
+
+        if date_format is None:
+            date_format = Parser._detect_date_format(dates)
+        elif date_format == 'mixed':
+            date_format = None
+        parsed_dates = Parser._parse_dates(dates, date_format)
+        invalid = parsed_dates.isna().to_numpy()
+        summary['skipped_invalid_dates'] = int(invalid.sum())
+        summary['date_format'] = date_format or 'mixed'
+        if invalid.any():
+            rows, descriptions, dates = rows[~invalid], descriptions[~invalid], dates[~invalid]
+            amounts, parsed_dates = amounts[~invalid], parsed_dates[~invalid]
+
+        hash_inputs = [f"{date}{description}{amount}" for date, description, amount
+                       in zip(dates.tolist(), descriptions.tolist(), amounts.tolist())]
+        if txid_col:
+            tx_values = rows.iloc[:, df.columns.get_loc(txid_col)]
+            tx_text = tx_values.astype(str)
+            has_txid = (tx_values.notna() & (tx_text != '')).tolist()
+            hash_inputs = [tx if use_txid else fallback
+                           for tx, use_txid, fallback in zip(tx_text.tolist(), has_txid, hash_inputs)]
+
+        frame = pd.DataFrame({
+            'id': [hashlib.sha256(value.encode('utf-8')).hexdigest()[:10] for value in hash_inputs],
+            'date': parsed_dates.to_numpy(),
+            'month': Parser._month_keys(parsed_dates),
+            'description': descriptions.str.slice(0, 150).to_numpy(),
+            'amount': amounts,
+            'category': None,
+        }, columns=TRANSACTION_COLUMNS)
+        return frame, summary
+
+    @staticmethod
+    def _detect_date_format(dates):
+        """Return the known format that parses most of a sample of a file's dates, or None."""
+        sample = dates.head(DATE_SAMPLE_SIZE).str.strip()
+        best_format, best_count = None, 0
+        for date_format in DATE_FORMATS:
+            count = int(pd.to_datetime(sample, format=date_format, errors='coerce').notna().sum())
+            if count > best_count:
+                best_format, best_count = date_format, count
+            if best_count == len(sample):
+                break
+        return best_format
+
+    @staticmethod
+    def _parse_dates(dates, date_format=None):
+        """Parse a date column with the file's format; anything left over gets mixed inference once."""
+        dates = dates.str.strip()
+        if date_format is None:
+            return pd.to_datetime(dates, dayfirst=True, format='mixed', errors='coerce')
+        parsed = pd.to_datetime(dates, format=date_format, errors='coerce')
+        leftover = parsed.isna()
+        if leftover.any():
+            parsed[leftover] = pd.to_datetime(dates[leftover], dayfirst=True, format='mixed', errors='coerce')
+        return parsed
+
+    @staticmethod
+    def _month_keys(parsed_dates):
+        """Return 'YYYY-MM' keys, formatting each distinct month only once."""
+        keys = (parsed_dates.dt.year * 100 + parsed_dates.dt.month).to_numpy()
+        codes, months = pd.factorize(keys)
+        labels = np.array([f"{month // 100:04d}-{month % 100:02d}" for month in months], dtype=object)
+        return labels[codes]
+
+    @staticmethod
+    def _join_descriptions(rows):
+        """Join the distinct, non-empty description columns of each row with ' - '."""
+        descriptions = np.full(len(rows), '', dtype=object)
+        previous_parts = []
+        for col in DESCRIPTION_COLUMNS:
+            if col not in rows.columns:
+                continue
+            values = rows.iloc[:, rows.columns.get_loc(col)]
+            part = values.astype(str).str.strip()
+            part = part.where(values.notna() & ~part.isin(NAN_TEXTS), '').to_numpy(dtype=object)
+
+            add = part != ''
+            for previous in previous_parts:
+                add &= part != previous
+            previous_parts.append(part)
+            joined = np.where(descriptions == '', part, descriptions + ' - ' + part)
+            descriptions = np.where(add, joined, descriptions)
+        descriptions[descriptions == ''] = 'Unknown Transaction'
+        return pd.Series(descriptions, index=rows.index, dtype=object)
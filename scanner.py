@@ -1,9 +1,15 @@
 import glob
 import os
+import threading
 
 from app_paths import documents_dir
 
 
+# Events that add or change a statement; opening or reading a file is ignored. Deleted statements
+# stay in the transaction database until they are removed in the app, so deletions are ignored too.
+WATCHED_EVENTS = {"created", "modified", "moved", "closed"}
+
+
 class Scanner:
     def __init__(self, watch_path=None):
         self.watch_path = watch_path or str(documents_dir() / "BankStatements")
@@ -12,3 +18,76 @@ class Scanner:
     def scan_for_csvs(self):
         pattern = os.path.join(self.watch_path, "*.csv")
         return glob.glob(pattern)
+
+    def watch(self, callback, debounce=0.5):
+        """Call ``callback(paths)`` from a background thread with the CSVs created, changed or moved in.
+
+        Events are collected until the folder has been quiet for ``debounce`` seconds, so a statement
+        that is still being copied is reported once. Returns the running ``FolderWatcher``, or ``None``
+        when watchdog is not installed.
+        """
+        try:
+            from watchdog.observers import Observer
+        except ImportError:
+            print("watchdog is not installed; changes in the statement folder are not picked up automatically.")
+            return None
+        watcher = FolderWatcher(self.watch_path, callback, debounce)
+        observer = Observer()
+        observer.schedule(watcher, self.watch_path, recursive=False)
+        watcher.start(observer)
+        return watcher
+
+
+class FolderWatcher:
+    """Watchdog event handler that batches CSV changes in one folder."""
+
+    def __init__(self, folder, callback, debounce):
+        self.folder = os.path.normcase(os.path.abspath(folder))
+        self.callback = callback
+        self.debounce = debounce
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._timer = None
+        self._observer = None
+
+    def start(self, observer):
+        self._observer = observer
+        observer.start()
+
+    def stop(self):
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._pending.clear()
+
+    def dispatch(self, event):
+        """Entry point called by the watchdog observer for every file-system event."""
+        if event.is_directory or event.event_type not in WATCHED_EVENTS:
+            return
+        # A moved file only matters where it arrives; the place it left behaves like a deletion.
+        path = os.fsdecode(event.dest_path if event.event_type == "moved" else event.src_path)
+        paths = [path] if self._is_statement(path) else []
+        if not paths:
+            return
+        with self._lock:
+            self._pending.update(dict.fromkeys(paths))
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self._flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _is_statement(self, path):
+        # Matches what scan_for_csvs globs: *.csv directly inside the watched folder, case-insensitively on Windows.
+        path = os.path.normcase(os.path.abspath(path))
+        return os.path.dirname(path) == self.folder and path.endswith(".csv")
+
+    def _flush(self):
+        with self._lock:
+            paths, self._pending, self._timer = list(self._pending), {}, None
+        if paths:
+            self.callback(paths)
@@ -0,0 +1,93 @@
+"""Token index that answers the transaction search box without scanning every description."""
+
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+# Recently searched terms stay cached so typing and deleting characters does not search again.
+TERM_CACHE_SIZE = 64
+
+
+class SearchIndex:
+    """Case-insensitive substring search over descriptions, built once per data change.
+
+    Every distinct description is split into whitespace tokens. A search term without
+    whitespace occurs in a description exactly when it occurs in one of its tokens, so a
+    term is answered by scanning the (much smaller) token vocabulary once and joining the
+    posting lists of the matching tokens. Several terms must all match.
+    """
+
+    def __init__(self, descriptions):
+        codes, uniques = pd.factorize(pd.Series(descriptions, dtype=object).fillna(""), sort=False)
+        self._codes = codes
+        self._description_count = len(uniques)
+        postings = {}
+        for description_id, description in enumerate(uniques):
+            for token in set(str(description).casefold().split()):
+                postings.setdefault(token, []).append(description_id)
+        tokens = list(postings)
+        # Posting lists are stored back to back; token i owns values[offsets[i]:offsets[i + 1]].
+        sizes = np.fromiter((len(postings[token]) for token in tokens), dtype=np.int64, count=len(tokens))
+        self._posting_offsets = np.concatenate(([0], np.cumsum(sizes)))
+        self._posting_values = np.fromiter(
+            (description_id for token in tokens for description_id in postings[token]),
+            dtype=np.int64, count=int(self._posting_offsets[-1]),
+        )
+        # Tokens never contain whitespace, so a newline cannot be part of a match.
+        self._vocabulary = "\n".join(tokens)
+        lengths = np.fromiter((len(token) + 1 for token in tokens), dtype=np.int64, count=len(tokens))
+        self._token_starts = np.concatenate(([0], np.cumsum(lengths)[:-1])) if tokens else lengths
+        self._term_cache = OrderedDict()
+
+    def __len__(self):
+        return len(self._codes)
+
+    def matches(self, query, rows=None):
+        """Return a boolean mask of the descriptions containing every whitespace-separated term.
+
+        The mask covers all rows, or only the given row positions when ``rows`` is passed.
+        """
+        codes = self._codes if rows is None else self._codes[rows]
+        terms = list(dict.fromkeys(query.casefold().split()))
+        if not terms:
+            return np.ones(len(codes), dtype=bool)
+        matching = np.ones(self._description_count, dtype=bool)
+        for term in sorted(terms, key=len, reverse=True):
+            matching &= self._term_matches(term)
+            if not matching.any():
+                break
+        return matching[codes]
+
+    def _term_matches(self, term):
+        cached = self._term_cache.get(term)
+        if cached is not None:
+            self._term_cache.move_to_end(term)
+            return cached
+
+        matching = np.zeros(self._description_count, dtype=bool)
+        tokens = self._matching_tokens(term)
+        if len(tokens):
+            starts, ends = self._posting_offsets[tokens], self._posting_offsets[tokens + 1]
+            sizes = ends - starts
+            # Positions of all selected posting lists, gathered without a Python loop per token.
+            positions = np.arange(int(sizes.sum())) - np.repeat(np.cumsum(sizes) - sizes - starts, sizes)
+            matching[self._posting_values[positions]] = True
+        self._term_cache[term] = matching
+        if len(self._term_cache) > TERM_CACHE_SIZE:
+            self._term_cache.popitem(last=False)
+        return matching
+
+    def _matching_tokens(self, term):
+        """Return the ids of all vocabulary tokens that contain ``term``."""
+        vocabulary, hits = self._vocabulary, []
+        position = vocabulary.find(term)
+        while position != -1:
+            hits.append(position)
+            # Continue after this token; one hit per token is enough.
+            token_end = vocabulary.find("\n", position + len(term))
+            if token_end == -1:
+                break
+            position = vocabulary.find(term, token_end + 1)
+        return np.searchsorted(self._token_starts, np.array(hits, dtype=np.int64), side="right") - 1
@@ -34,6 +34,21 @@ class TestStatisticsExportSelection(unittest.TestCase):
 
         self.assertTrue(statistics_for_categories(totals, []).empty)
 
+@unittest.skipIf(pd is None, "pandas is not installed")
+class TestTransactionTableModel(unittest.TestCase):
+
+    def test_rows_are_found_in_blocks_of_any_length(self):
+        from desktop_app import TransactionTableModel
+
+        # The result shrank between fetches, so the first block came back short.
+        blocks = [["a", "b"], ["c", "d", "e"]]
+        fetch = lambda number: (pd.DataFrame({"description": blocks[number]}), 5)
+        model = TransactionTableModel(["Description"], ["description"])
+        model.set_source(fetch)
+        model.fetchMore()
+
+        self.assertEqual([model.row(row)["Description"] for row in range(model.rowCount())], ["a", "b", "c", "d", "e"])
+
 @unittest.skipIf(pd is None, "pandas is not installed")
 class TestYearlyStatisticsExport(unittest.TestCase):
 
@@ -77,3 +92,56 @@ class TestYearlyStatisticsExport(unittest.TestCase):
             self.assertEqual(averages_sheet["B2"].value, 26.67)
             self.assertEqual(averages_sheet["B2"].number_format, "#,##0.##")
             workbook.close()
+
+    def test_cancelled_export_leaves_an_existing_report_untouched(self):
+        import os
+        import tempfile
+        from pathlib import Path
+
+        from desktop_app import selected_expenses_for_export, write_yearly_statistics_export
+
+        frame = pd.DataFrame({
+            "date": pd.to_datetime(["2025-12-10", "2026-01-12", "2026-02-03"]),
+            "amount": [-10.0, -20.0, -30.0],
+            "category": ["Food", "Food", "Food"],
+        })
+        selected = selected_expenses_for_export(frame, ["Food"])
+        calls = []
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "yearly_report.xlsx"
+            path.write_bytes(b"previous report")
+            written = write_yearly_statistics_export(path, selected, ["Food"], [], lambda *sheets: calls.append(sheets) or False)
+
+            self.assertFalse(written)
+            self.assertEqual(calls, [(1, 8)])
+            self.assertEqual(path.read_bytes(), b"previous report")
+            self.assertEqual(os.listdir(directory), ["yearly_report.xlsx"])
+
+            calls.clear()
+            self.assertTrue(write_yearly_statistics_export(path, selected, ["Food"], [], lambda *sheets: calls.append(sheets)))
+            self.assertEqual(calls[-1], (8, 8))
+            with pd.ExcelFile(path) as workbook:
+                self.assertEqual(workbook.sheet_names[:3], ["2025-12", "2026-01", "2026-02"])
+            self.assertEqual(os.listdir(directory), ["yearly_report.xlsx"])
+
+    def test_exported_report_gets_the_permissions_of_a_normally_written_file(self):
+        import os
+        import stat
+        import tempfile
+        from pathlib import Path
+
+        from desktop_app import selected_expenses_for_export, write_yearly_statistics_export
+
+        frame = pd.DataFrame({"date": pd.to_datetime(["2026-01-12"]), "amount": [-20.0], "category": ["Food"]})
+        selected = selected_expenses_for_export(frame, ["Food"])
+
+        with tempfile.TemporaryDirectory() as directory:
+            reference, path = Path(directory) / "reference.txt", Path(directory) / "yearly_report.xlsx"
+            reference.write_bytes(b"")
+            self.assertTrue(write_yearly_statistics_export(path, selected, ["Food"], []))
+            self.assertEqual(stat.S_IMODE(path.stat().st_mode), stat.S_IMODE(reference.stat().st_mode))
+
+            os.chmod(path, 0o640)
+            self.assertTrue(write_yearly_statistics_export(path, selected, ["Food"], []))
+            self.assertEqual(stat.S_IMODE(path.stat().st_mode), 0o640)
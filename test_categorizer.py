@@ -28,6 +28,31 @@ class TestCategorizer(unittest.TestCase):
         self.assertEqual(self.categorizer.suggest_category("NETTO DISCOUNT"), "Sonstiges")
         self.assertEqual(self.categorizer.suggest_category("pay via net transfer"), "Internet")
 
+    def test_first_matching_rule_wins_for_overlapping_keywords(self):
+        self.categorizer.add_rule(["markt"], "Markets")
+        self.categorizer.add_rule(["rewe markt", "rewe"], "Supermarkt")
+        self.categorizer.add_rule(["paypal *"], "Paypal")
+        self.assertEqual(self.categorizer.suggest_category("REWE Markt GmbH"), "Markets")
+        self.assertEqual(self.categorizer.suggest_category("REWE Berlin"), "Supermarkt")
+        self.assertEqual(self.categorizer.suggest_category("PAYPAL *SPOTIFY"), "Paypal")
+        self.assertEqual(self.categorizer.suggest_category("PAYPAL * SPOTIFY"), "Sonstiges")
+
+    def test_categorize_many_matches_each_distinct_description_once(self):
+        self.categorizer.add_rule(["spotify"], "Abos")
+        matched = []
+        categorize_lowered = self.categorizer._categorize_lowered
+        self.categorizer._categorize_lowered = lambda desc: matched.append(desc) or categorize_lowered(desc)
+
+        categories = self.categorizer.categorize_many(["Spotify AB", "REWE", "Spotify AB", "spotify ab"])
+
+        self.assertEqual(categories, ["Abos", "Sonstiges", "Abos", "Abos"])
+        self.assertEqual(matched, ["spotify ab", "rewe"])
+
+    def test_categorize_many_cache_is_dropped_when_rules_change(self):
+        self.assertEqual(self.categorizer.categorize_many(["REWE"]), ["Sonstiges"])
+        self.categorizer.add_rule(["rewe"], "Supermarkt")
+        self.assertEqual(self.categorizer.categorize_many(["REWE"]), ["Supermarkt"])
+
     def test_update_and_delete_rule_take_effect_immediately(self):
         self.categorizer.add_rule(["rewe"], "Supermarkt")
         self.assertTrue(self.categorizer.update_rule_keywords("Supermarkt", ["aldi"]))
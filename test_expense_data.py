@@ -1,25 +1,66 @@
-﻿import unittest
+﻿import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
 
+import pandas as pd
+
+from categorizer import Categorizer
 from expense_data import ExpenseDataStore
+from parser import Parser
+from transaction_db import TransactionDatabase
 
 
 class ScannerStub:
+    def __init__(self, files=("scanned.csv",)):
+        self.files = list(files)
+
     def scan_for_csvs(self):
-        return ["scanned.csv"]
+        return list(self.files)
 
 
 class ParserStub:
-    def parse_bank_statement_with_report(self, path):
-        return ([
-            {"date": "01.07.2026", "description": "MAYER Energie", "amount": -10.0},
-            {"date": "02.07.2026", "description": "Other payment", "amount": -20.0},
-        ], {"status": "Imported"})
+    def __init__(self):
+        self.parsed = []
+
+    def parse_bank_statement_frame(self, path):
+        self.parsed.append(path)
+        return pd.DataFrame([
+            {"date": pd.Timestamp("2026-07-01"), "month": "2026-07", "description": "MAYER Energie", "amount": -10.0},
+            {"date": pd.Timestamp("2026-07-02"), "month": "2026-07", "description": "Other payment", "amount": -20.0},
+        ]), {"status": "Imported"}
 
 
 class CategorizerStub:
+    rules = []
+
     def suggest_category(self, description):
         return "Utilities" if "Energie" in description else "Sonstiges"
 
+    def categorize_many(self, descriptions):
+        return [self.suggest_category(description) for description in descriptions]
+
+
+class StatementFolderTestCase(unittest.TestCase):
+    """Gives each test a temporary folder to write bank statements into."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def write_statement(self, name, *rows):
+        """Write ``(date, description, amount)`` rows as a statement under ``name`` and return its path."""
+        path = os.path.join(self.test_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as statement:
+            statement.write("Datum;Name;Betrag\n")
+            for row in rows:
+                statement.write(";".join(row) + "\n")
+        return path
+
 
 class TestExpenseDataStore(unittest.TestCase):
     def setUp(self):
@@ -31,12 +72,357 @@ class TestExpenseDataStore(unittest.TestCase):
         self.assertEqual(len(self.store.filtered(query="MAYER")), 1)
         self.assertEqual(len(self.store.filtered(query="mayer.*")), 0)
         self.assertEqual(len(self.store.filtered(category="Utilities", month="2026-07", query="energie")), 1)
+        self.assertEqual(len(self.store.filtered(query="energie may")), 1)
+
+    def test_category_and_month_filters_use_row_indexes_built_once(self):
+        self.assertEqual(self.store.filtered(category="Utilities")["description"].tolist(), ["MAYER Energie"])
+        self.assertEqual(len(self.store.filtered(month="2026-07")), 2)
+        self.assertTrue(self.store.filtered(category="Utilities", month="2026-08").empty)
+        self.assertTrue(self.store.filtered(category="Unknown").empty)
+
+        with patch.object(self.store, "_build_frame", wraps=self.store._build_frame) as build:
+            self.store.filtered(category="Sonstiges", month="2026-07")
+            build.assert_not_called()
+
+    def test_pages_match_a_stable_sort_of_the_filtered_frame(self):
+        self.store.begin_reload()
+        self.store.add_statement("scanned.csv", "Scanned", pd.DataFrame([
+            {"date": pd.Timestamp(f"2026-07-{day % 5 + 1:02d}"), "month": "2026-07", "description": f"Payment {day % 3}",
+             "amount": -float(day % 4)}
+            for day in range(23)
+        ]), {"status": "Imported"})
+        for column in ("date", "description", "amount"):
+            for descending in (True, False):
+                expected = self.store.filtered(query="payment").sort_values(column, ascending=not descending, kind="stable")
+                for page in (1, 2, 3):
+                    frame, total = self.store.page("All", "All", "payment", column, descending, page, 10)
+                    self.assertEqual(total, 23)
+                    pd.testing.assert_frame_equal(frame, expected.iloc[(page - 1) * 10:page * 10])
+
+    def test_dataframe_is_typed_and_built_once_per_data_change(self):
+        frame = self.store.dataframe
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(frame["date"]))
+        self.assertIsInstance(frame["category"].dtype, pd.CategoricalDtype)
+
+        with patch.object(self.store, "_build_frame", wraps=self.store._build_frame) as build:
+            self.store.filtered(query="mayer")
+            self.store.months()
+            build.assert_not_called()
+            self.store.reload([])
+            self.store.dataframe
+            build.assert_called_once()
 
     def test_reports_keep_the_import_source_file(self):
         self.assertEqual(self.store.import_reports[0]["File"], "scanned.csv")
 
+    def test_statements_can_be_parsed_and_added_one_at_a_time(self):
+        parser = ParserStub()
+        store = ExpenseDataStore(ScannerStub(), parser, CategorizerStub())
+        jobs = store.begin_reload(["imported.csv"])
+        self.assertEqual(jobs, [("scanned.csv", "Scanned"), ("imported.csv", "Imported")])
+
+        statements = store.parse_statements(jobs)
+        store.add_statement(*jobs[0], *next(statements))
+        statements.close()
+
+        self.assertEqual(parser.parsed, ["scanned.csv"])
+        self.assertEqual(len(store.dataframe), 2)
+        self.assertEqual(store.import_reports[0]["File"], "scanned.csv")
+
     def test_reload_does_not_import_a_scanned_file_twice_when_it_was_also_selected(self):
         self.store.reload(["scanned.csv"])
 
         self.assertEqual(len(self.store.transactions), 2)
         self.assertEqual([transaction["source"] for transaction in self.store.transactions], ["Scanned", "Scanned"])
+
+
+class TestExpenseDataStoreRecategorize(StatementFolderTestCase):
+    def setUp(self):
+        super().setUp()
+        self.categorizer = Categorizer(rules_path=os.path.join(self.test_dir, "rules.json"))
+        self.categorizer.add_rule(["mayer"], "Utilities")
+        self.categorizer.add_rule(["payment"], "Transfers")
+        self.parser = ParserStub()
+        self.store = ExpenseDataStore(ScannerStub(), self.parser, self.categorizer)
+        self.store.reload([])
+
+    def categories(self):
+        return [transaction["category"] for transaction in self.store.transactions]
+
+    def test_rule_changes_are_applied_without_parsing_again(self):
+        self.categorizer.add_rule(["energie"], "Energy")
+        self.categorizer.delete_rule("Transfers")
+
+        self.assertEqual(self.store.recategorize(), 1)
+        self.assertEqual(self.categories(), ["Utilities", "Sonstiges"])
+        self.assertEqual(self.parser.parsed, ["scanned.csv"])
+
+    def test_only_transactions_at_or_after_the_first_changed_rule_are_categorized(self):
+        self.categorizer.update_rule_keywords("Transfers", ["other"])
+        calls = []
+        categorize_many = self.categorizer.categorize_many
+        self.categorizer.categorize_many = lambda descriptions: calls.extend(descriptions) or categorize_many(descriptions)
+
+        self.store.recategorize()
+
+        self.assertEqual(calls, ["Other payment"])
+        self.assertEqual(self.categories(), ["Utilities", "Transfers"])
+
+
+class TestExpenseDataStoreStoredStatements(StatementFolderTestCase):
+    def setUp(self):
+        super().setUp()
+        self.statement = self.write_statement("statement.csv", ("01.07.2026", "Energie", "-10,00"))
+        self.parser = ParserStub()
+        self.store = ExpenseDataStore(
+            ScannerStub([self.statement]), self.parser, CategorizerStub(),
+            TransactionDatabase(os.path.join(self.test_dir, "transactions.sqlite3")),
+        )
+
+    def test_reload_parses_only_new_or_changed_statements(self):
+        self.store.reload()
+        self.store.reload()
+        self.assertEqual(self.parser.parsed, [self.statement])
+        self.assertEqual(len(self.store.transactions), 2)
+
+        with open(self.statement, "a", encoding="utf-8") as statement:
+            statement.write("02.07.2026;Other;-20,00\n")
+        self.store.reload()
+        self.assertEqual(self.parser.parsed, [self.statement, self.statement])
+
+
+class TestExpenseDataStoreTransactionDatabase(StatementFolderTestCase):
+    def setUp(self):
+        super().setUp()
+        self.statement = self.write_statement(
+            "statement.csv", ("01.07.2026", "MAYER Energie", "-10,00"), ("02.07.2026", "Other payment", "-20,00")
+        )
+        self.categorizer = Categorizer(rules_path=os.path.join(self.test_dir, "rules.json"))
+        self.categorizer.add_rule(["mayer"], "Utilities")
+        self.database = TransactionDatabase(os.path.join(self.test_dir, "transactions.sqlite3"))
+        self.store = ExpenseDataStore(ScannerStub([self.statement]), Parser(), self.categorizer, self.database)
+
+    def stored_categories(self, path=None):
+        self.store.save_categories(self.store.take_unsaved_categories())
+        return self.database.load(path or self.statement)[0]["category"].tolist()
+
+    def test_assigned_categories_are_stored_and_kept_up_to_date(self):
+        self.store.reload()
+        self.assertEqual(self.stored_categories(), ["Utilities", "Sonstiges"])
+
+        self.categorizer.add_rule(["payment"], "Transfers")
+        self.store.recategorize()
+        other_id = self.store.transactions.statement(self.statement, "Scanned").ids[1]
+        self.assertEqual(self.store.take_unsaved_categories(), {self.statement: {other_id: "Transfers"}})
+        self.store.save_categories({self.statement: {other_id: "Transfers"}})
+        self.assertEqual(self.stored_categories(), ["Utilities", "Transfers"])
+
+        with patch.object(Parser, "parse_bank_statement_frame") as parse:
+            self.store.reload()
+        parse.assert_not_called()
+        self.assertEqual([transaction["category"] for transaction in self.store.transactions], ["Utilities", "Transfers"])
+
+    def test_statements_with_the_same_file_name_in_different_folders_are_kept_apart(self):
+        imported = [
+            self.write_statement(os.path.join(folder, "export.csv"), ("03.07.2026", description, "-30,00"))
+            for folder, description in (("january", "January payment"), ("february", "February payment"))
+        ]
+        self.store.reload(imported)
+
+        self.categorizer.add_rule(["payment"], "Transfers")
+        self.store.recategorize()
+        for path in imported:
+            self.assertEqual(self.stored_categories(path), ["Transfers"])
+        self.assertEqual(self.store.transactions.statement(imported[0], "Imported").descriptions(), ["January payment"])
+
+    def test_stored_statements_are_read_one_at_a_time_while_importing(self):
+        imported = self.write_statement("imported.csv", ("03.07.2026", "Rent", "-500,00"))
+        self.store.reload([imported])
+        jobs = self.store.begin_reload()
+
+        with patch.object(self.database, "load", wraps=self.database.load) as load:
+            batches = self.store.parse_statement_batches(jobs)
+            position, frame, _, complete = next(batches)
+            self.assertEqual(load.call_count, 1)
+            self.assertEqual((position, len(frame), complete), (0, 2, True))
+            self.assertEqual(len(list(batches)), 1)
+        self.assertEqual(load.call_count, 2)
+
+    def test_stored_statements_are_loaded_at_startup_until_they_are_removed(self):
+        imported = self.write_statement("imported.csv", ("03.07.2026", "Rent", "-500,00"))
+        self.store.reload([imported])
+        os.remove(self.statement)
+        self.assertEqual(self.store.update_scanned_files([self.statement]), 0)
+
+        restarted = ExpenseDataStore(self.store.scanner, Parser(), self.categorizer, self.database)
+        with patch.object(Parser, "parse_bank_statement_frame") as parse:
+            restarted.reload()
+        parse.assert_not_called()
+        self.assertEqual(
+            [(transaction["description"], transaction["source"]) for transaction in restarted.transactions],
+            [("MAYER Energie", "Scanned"), ("Other payment", "Scanned"), ("Rent", "Imported")],
+        )
+
+        self.assertEqual(restarted.remove_statements([(self.statement, "Scanned"), (imported, "Imported")]), 2)
+        self.assertEqual(len(restarted.transactions), 0)
+        self.assertEqual(self.database.statements(), [])
+        restarted.scanner.files = []
+        restarted.reload()
+        self.assertEqual(restarted.import_reports, [])
+
+
+class TestExpenseDataStoreScannedFileUpdates(StatementFolderTestCase):
+    def setUp(self):
+        super().setUp()
+        self.first = self.write_statement("first.csv", ("01.07.2026", "Energie", "-11,00"))
+        self.second = self.write_statement("second.csv", ("01.07.2026", "Payment", "-11,00"))
+        self.store = ExpenseDataStore(ScannerStub([self.first, self.second]), Parser(), CategorizerStub())
+        self.store.reload([])
+
+    def descriptions(self):
+        return sorted(transaction["description"] for transaction in self.store.transactions)
+
+    def test_new_changed_and_deleted_statements_are_applied_individually(self):
+        untouched = self.store.transactions.statement(self.second, "Scanned")
+        self.assertIsNotNone(untouched)
+        third = self.write_statement("third.csv", ("01.07.2026", "Rent", "-11,00"))
+        self.write_statement("first.csv", ("01.07.2026", "Energie", "-11,00"), ("02.07.2026", "Water", "-12,00"))
+
+        self.assertEqual(self.store.update_scanned_files([third, self.first]), 2)
+        self.assertEqual(self.descriptions(), ["Energie", "Payment", "Rent", "Water"])
+        self.assertEqual([report["File"] for report in self.store.import_reports], ["second.csv", "third.csv", "first.csv"])
+        self.assertIs(self.store.transactions.statement(self.second, "Scanned"), untouched)
+
+        os.remove(self.first)
+        self.assertEqual(self.store.update_scanned_files([self.first]), 0)
+        self.assertEqual(self.descriptions(), ["Energie", "Payment", "Rent", "Water"])
+        self.assertEqual(self.store.remove_statements([(self.first, "Scanned")]), 1)
+        self.assertEqual(self.descriptions(), ["Payment", "Rent"])
+        self.assertEqual(len(self.store.dataframe), 2)
+
+
+class TestExpenseDataStoreDeduplication(StatementFolderTestCase):
+    def setUp(self):
+        super().setUp()
+        rent, coffee, energie = ("01.07.2026", "Rent", "-10,00"), ("02.07.2026", "Coffee", "-10,00"), ("03.07.2026", "Energie", "-10,00")
+        self.quarter = self.write_statement("quarter.csv", rent, coffee, coffee)
+        self.month = self.write_statement("month.csv", coffee, energie)
+        self.store = ExpenseDataStore(ScannerStub([self.quarter, self.month]), Parser(), CategorizerStub())
+        self.store.reload([])
+
+    def descriptions(self):
+        return sorted(transaction["description"] for transaction in self.store.transactions)
+
+    def test_transactions_already_imported_from_another_file_are_skipped_and_reported(self):
+        self.assertEqual(self.descriptions(), ["Coffee", "Coffee", "Energie", "Rent"])
+        reports = {report["File"]: report for report in self.store.import_reports}
+        self.assertEqual(reports["quarter.csv"]["skipped_duplicates"], 0)
+        self.assertEqual(reports["month.csv"]["skipped_duplicates"], 1)
+        self.assertEqual(reports["month.csv"]["imported_expenses"], 1)
+
+    def test_removing_a_statement_restores_the_rows_it_had_covered(self):
+        self.store.remove_statements([(self.quarter, "Scanned")])
+
+        self.assertEqual(self.descriptions(), ["Coffee", "Energie"])
+        self.assertEqual(self.store.import_reports[0]["skipped_duplicates"], 0)
+
+    def test_streamed_batches_build_the_same_store_as_whole_statements(self):
+        streamed = ExpenseDataStore(self.store.scanner, Parser(), CategorizerStub())
+        jobs = streamed.begin_reload([])
+        progress = []
+        with patch("expense_data.IMPORT_BATCH_ROWS", 1):
+            for position, frame, report, complete in streamed.parse_statement_batches(jobs):
+                streamed.add_statement(*jobs[position], frame, report, complete)
+                progress.append((position, len(streamed.transactions), streamed.import_reports[-1]["status"]))
+
+        self.assertEqual(progress, [
+            (0, 1, "Importing"), (0, 2, "Importing"), (0, 3, "Importing"), (0, 3, "Imported"),
+            (1, 3, "Importing"), (1, 4, "Importing"), (1, 4, "Imported"),
+        ])
+        pd.testing.assert_frame_equal(streamed.dataframe, self.store.dataframe)
+        self.assertEqual(streamed.import_reports, self.store.import_reports)
+
+    def test_statement_cut_off_while_streaming_is_discarded(self):
+        jobs = self.store.begin_reload([])
+        batches = self.store.parse_statement_batches(jobs)
+        with patch("expense_data.IMPORT_BATCH_ROWS", 1):
+            position, frame, report, complete = next(batches)
+        batches.close()
+        self.store.add_statement(*jobs[position], frame, report, complete)
+        self.assertEqual(len(self.store.transactions), 1)
+
+        self.assertTrue(self.store.discard_pending_statement())
+        self.assertEqual(len(self.store.transactions), 0)
+        self.assertEqual(self.store.import_reports, [])
+        self.assertEqual(self.store.totals.transactions, 0)
+
+
+class TestExpenseDataStoreTotals(StatementFolderTestCase):
+    def setUp(self):
+        super().setUp()
+        self.first = self.write_statement("first.csv", ("01.07.2026", "Energie", "-10,00"), ("02.07.2026", "Salary", "500,00"))
+        self.second = self.write_statement("second.csv", ("03.08.2026", "Payment", "-20,50"), ("04.01.2027", "Energie", "-5,00"))
+        self.categorizer = Categorizer(rules_path=os.path.join(self.test_dir, "rules.json"))
+        self.categorizer.add_rule(["energie"], "Utilities")
+        self.store = ExpenseDataStore(ScannerStub([self.first, self.second]), Parser(), self.categorizer)
+        self.store.reload([])
+
+    def assertTotalsMatchFrame(self):
+        frame = self.store.dataframe
+        expenses = frame[frame["amount"] < 0]
+        totals = self.store.totals
+        self.assertEqual(totals.transactions, len(frame))
+        self.assertEqual(totals.categorized, int((frame["category"] != "Sonstiges").sum()))
+        self.assertAlmostEqual(totals.spent, -expenses["amount"].sum())
+        for key, spent_by in (("category", totals.spent_by_category), ("Month", totals.spent_by_month)):
+            expected = (-expenses.groupby(key, observed=True)["amount"].sum()).to_dict()
+            self.assertEqual(spent_by.keys(), expected.keys())
+            for value, spent in expected.items():
+                self.assertAlmostEqual(spent_by[value], spent)
+        self.assertEqual(totals.spent_by_year.keys(), set(expenses["date"].dt.year))
+
+    def test_totals_follow_imports_recategorization_and_removed_statements(self):
+        self.assertTotalsMatchFrame()
+        self.assertEqual(self.store.totals.spent_by_category, {"Utilities": 15.0, "Sonstiges": 20.5})
+        self.assertEqual(self.store.totals.spent_by_year, {2026: 30.5, 2027: 5.0})
+
+        self.categorizer.add_rule(["payment"], "Transfers")
+        self.store.recategorize()
+        self.assertTotalsMatchFrame()
+        self.assertNotIn("Sonstiges", self.store.totals.spent_by_category)
+
+        self.store.remove_statements([(self.second, "Scanned")])
+        self.assertTotalsMatchFrame()
+        self.assertEqual(self.store.totals.spent_by_month, {"2026-07": 10.0})
+
+
+class TestExpenseDataStoreParallelImport(StatementFolderTestCase):
+    def setUp(self):
+        super().setUp()
+        self.statements = [
+            self.write_statement(
+                f"statement_{index}.csv",
+                (f"0{index + 1}.07.2026", f"Energie {index}", f"-1{index},00"),
+                (f"0{index + 2}.07.2026", f"Payment {index}", f"-2{index},00"),
+            )
+            for index in range(4)
+        ]
+
+    def load(self, workers):
+        store = ExpenseDataStore(ScannerStub(self.statements[:2]), Parser(), CategorizerStub(), workers=workers)
+        store.reload(self.statements[2:])
+        return store
+
+    def test_parallel_import_matches_sequential_import_in_order(self):
+        sequential, parallel = self.load(1), self.load(2)
+
+        self.assertEqual(list(parallel.transactions), list(sequential.transactions))
+        self.assertEqual(parallel.import_reports, sequential.import_reports)
+        self.assertEqual(
+            [transaction["file"] for transaction in parallel.transactions],
+            [os.path.basename(path) for path in self.statements for _ in range(2)],
+        )
+        self.assertEqual(
+            [transaction["source"] for transaction in parallel.transactions],
+            ["Scanned"] * 4 + ["Imported"] * 4,
+        )
@@ -0,0 +1,39 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from parse_cache import file_fingerprint, is_unchanged
+
+
+class TestFileFingerprint(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.statement = os.path.join(self.test_dir, "statement.csv")
+        with open(self.statement, "w", encoding="utf-8") as statement:
+            statement.write("Datum;Name;Betrag\n01.07.2026;Energie;-10,00\n")
+        self.fingerprint = file_fingerprint(self.statement)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def touch(self):
+        stat = os.stat(self.statement)
+        os.utime(self.statement, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+    def test_touched_file_with_the_same_content_is_unchanged(self):
+        self.assertTrue(is_unchanged(self.statement, os.stat(self.statement), self.fingerprint))
+        self.touch()
+
+        self.assertTrue(is_unchanged(self.statement, os.stat(self.statement), self.fingerprint))
+
+    def test_changed_content_of_the_same_size_is_detected(self):
+        with open(self.statement, "w", encoding="utf-8") as statement:
+            statement.write("Datum;Name;Betrag\n01.07.2026;Energie;-99,00\n")
+        self.touch()
+
+        self.assertFalse(is_unchanged(self.statement, os.stat(self.statement), self.fingerprint))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,12 @@
+import hashlib
+import os
+import tempfile
 import unittest
 import io
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
+
+import pandas as pd
+
 from parser import Parser
 
 class TestParser(unittest.TestCase):
@@ -8,66 +14,61 @@ class TestParser(unittest.TestCase):
     def setUp(self):
         self.parser = Parser()
 
-    @patch('parser.pd')
-    def test_parse_bank_statement_failed_load(self, mock_pd):
-        # Mock read_csv to always raise Exception
-        mock_pd.read_csv.side_effect = Exception("Failed")
-        file_input = MagicMock()
+    def test_parse_bank_statement_failed_load(self):
+        file_input = io.StringIO("just some text\nwithout an amount column\n")
 
         result = self.parser.parse_bank_statement(file_input)
         self.assertEqual(result, [])
 
-    @patch('parser.pd')
-    def test_parse_bank_statement_missing_columns(self, mock_pd):
-        mock_df = MagicMock()
-        mock_df.columns = ['Unknown1', 'Unknown2']
-        mock_pd.read_csv.return_value = mock_df
+    def test_parse_bank_statement_missing_columns(self):
+        file_input = io.StringIO("Unknown1;Betrag\n1;-2,00\n")
 
-        file_input = MagicMock()
         result = self.parser.parse_bank_statement(file_input)
         self.assertEqual(result, [])
 
-    @patch('parser.pd')
-    def test_parse_bank_statement_success(self, mock_pd):
-        mock_df = MagicMock()
-        # Ensure it passes the amount column check in the heuristic
-        mock_columns = MagicMock()
-        mock_columns.__iter__.return_value = ['Datum', 'Name', 'Betrag']
-        mock_columns.__contains__.side_effect = lambda col: col in ['Datum', 'Name', 'Betrag']
+    def test_parse_bank_statement_success(self):
+        file_input = io.StringIO(
+            "Datum;Name;Betrag\n"
+            "2023-01-01;Test Transaction 1;1.234,56\n"
+            "2023-01-02;Test Transaction 2;-50,00\n"
+            "2023-01-03;General Currency Conversion;10.0\n"
+            "2023-01-04;;100.0\n"
+        )
 
-        def mock_get_loc(col):
-            return ['Datum', 'Name', 'Betrag'].index(col)
-        mock_columns.get_loc = mock_get_loc
+        result = self.parser.parse_bank_statement(file_input)
 
-        mock_df.columns = mock_columns
+        self.assertEqual(len(result), 1) # Positive amounts and excluded rows are ignored
 
-        # Mock itertuples
-        # row: (Datum, Name, Betrag)
-        row1 = ('2023-01-01', 'Test Transaction 1', '1.234,56')
-        row2 = ('2023-01-02', 'Test Transaction 2', '-50,00')
-        row3 = ('2023-01-03', 'General Currency Conversion', '10.0') # Should be excluded
-        row4 = ('2023-01-04', float('nan'), '100.0') # nan description
+        tx2 = result[0]
+        self.assertEqual(tx2['date'], pd.Timestamp('2023-01-02'))
+        self.assertEqual(tx2['month'], '2023-01')
+        self.assertEqual(tx2['description'], 'Test Transaction 2')
+        self.assertEqual(tx2['amount'], -50.00)
 
-        mock_df.itertuples.return_value = [row1, row2, row3, row4]
+    def test_sniffing_parses_the_file_once_and_reports_the_dialect(self):
+        csv_data = io.BytesIO(
+            "Date,Name,Amount\n"
+            "2023-01-01,Café,-12.50\n".encode('latin-1')
+        )
 
-        # Mock isna
-        def mock_isna(val):
-            if isinstance(val, float) and str(val) == 'nan':
-                return True
-            return False
-        mock_pd.isna.side_effect = mock_isna
+        with patch('parser.pd.read_csv', wraps=pd.read_csv) as read_csv:
+            transactions, report = self.parser.parse_bank_statement_with_report(csv_data)
 
-        mock_pd.read_csv.return_value = mock_df
+        read_csv.assert_called_once()
+        self.assertEqual(transactions[0]['description'], 'Café')
+        self.assertEqual(
+            report['dialect'],
+            "separator ',', encoding latin-1, header row, amount column 'Amount'",
+        )
 
-        file_input = MagicMock()
-        result = self.parser.parse_bank_statement(file_input)
+    def test_headerless_easybank_layout_is_detected_without_the_file_name(self):
+        csv_data = io.StringIO('123456;Supermarket;2023-01-01;2023-01-01;-12,50;EUR\n')
 
-        self.assertEqual(len(result), 1) # Positive amounts and excluded rows are ignored
+        transactions, report = self.parser.parse_bank_statement_with_report(csv_data)
 
-        tx2 = result[0]
-        self.assertEqual(tx2['date'], '2023-01-02')
-        self.assertEqual(tx2['description'], 'Test Transaction 2')
-        self.assertEqual(tx2['amount'], -50.00)
+        self.assertEqual(report['imported_expenses'], 1)
+        self.assertIn('headerless EASYBANK layout', report['dialect'])
+        self.assertEqual(transactions[0]['description'], 'Supermarket')
 
     def test_parse_amount(self):
         test_cases = [
@@ -87,6 +88,18 @@ class TestParser(unittest.TestCase):
             with self.subTest(val=val):
                 self.assertEqual(self.parser._parse_amount(val), expected)
 
+    def test_parse_amounts_matches_scalar_parser(self):
+        values = [
+            "1.234,56", "1,234.56", "1234,56", "1234.56", "1,234", "123,45", "-1.234,56",
+            "  10.0  ", "", "12,34 ", "-.5", "5.", ".", "--1", "1-2", "€ -7,50", "EUR 3.000", None,
+        ]
+        for column in (pd.Series(values, dtype="str"), pd.Series(values + [100, float('nan')], dtype=object)):
+            with self.subTest(dtype=column.dtype):
+                self.assertEqual(
+                    self.parser._parse_amounts(column).tolist(),
+                    [self.parser._parse_amount(value) for value in column],
+                )
+
     def test_import_report_counts_imported_and_skipped_rows(self):
         csv_data = io.StringIO(
             "Datum;Name;Betrag\n"
@@ -105,6 +118,42 @@ class TestParser(unittest.TestCase):
         self.assertEqual(report['skipped_excluded'], 1)
         self.assertEqual(report['skipped_missing_data'], 1)
 
+    def test_frame_extraction_joins_distinct_description_columns(self):
+        csv_data = io.StringIO(
+            "Date,Name,Description,Type,Amount,Transaction ID\n"
+            "2023-01-01,Shop, Shop ,Payment,-5.00,\n"
+            "2023-01-02,nan,,Payment,-7.25,TX-1\n"
+            "2023-01-03,,,,-1.00,\n"
+        )
+
+        frame, report = self.parser.parse_bank_statement_frame(csv_data)
+
+        self.assertIsInstance(frame, pd.DataFrame)
+        self.assertEqual(frame['description'].tolist(), ['Shop - Payment', 'Payment', 'Unknown Transaction'])
+        self.assertEqual(frame['id'].tolist(), [
+            hashlib.sha256('2023-01-01Shop - Payment-5.0'.encode('utf-8')).hexdigest()[:10],
+            hashlib.sha256(b'TX-1').hexdigest()[:10],
+            hashlib.sha256('2023-01-03Unknown Transaction-1.0'.encode('utf-8')).hexdigest()[:10],
+        ])
+        self.assertEqual(report['imported_expenses'], 3)
+
+    def test_dates_are_parsed_once_per_file_and_invalid_dates_are_reported(self):
+        csv_data = io.StringIO(
+            "Datum;Name;Betrag\n"
+            "03.02.2023;Rent;-500,00\n"
+            "12.02.2023;Groceries;-12,50\n"
+            "not a date;Broken;-1,00\n"
+        )
+
+        transactions, report = self.parser.parse_bank_statement_with_report(csv_data)
+
+        self.assertEqual([transaction['date'] for transaction in transactions],
+                         [pd.Timestamp('2023-02-03'), pd.Timestamp('2023-02-12')])
+        self.assertEqual([transaction['month'] for transaction in transactions], ['2023-02', '2023-02'])
+        self.assertEqual(report['date_format'], '%d.%m.%Y')
+        self.assertEqual(report['skipped_invalid_dates'], 1)
+        self.assertEqual(report['imported_expenses'], 2)
+
     def test_easybank_headerless_csv_uses_fixed_headers(self):
         csv_data = io.StringIO(
             '123456;Supermarket;2023-01-01;2023-01-01;-12,50;EUR\n'
@@ -116,9 +165,75 @@ class TestParser(unittest.TestCase):
 
         self.assertEqual(report['rows_read'], 2)
         self.assertEqual(report['imported_expenses'], 1)
-        self.assertEqual(transactions[0]['date'], '2023-01-01')
+        self.assertEqual(transactions[0]['date'], pd.Timestamp('2023-01-01'))
         self.assertEqual(transactions[0]['description'], 'Supermarket')
         self.assertEqual(transactions[0]['amount'], -12.50)
 
+    def test_large_files_are_read_in_chunks_with_one_date_format(self):
+        rows = [
+            "Datum;Name;Betrag;Unused\n",
+            "03.02.2023;Rent;-500,00;x\n",
+            "04.02.2023;Salary;1000,00;x\n",
+            # Also valid as 2023-01-02 in another format; the first chunk settles the format.
+            "2023-01-02;Groceries;-12,50;x\n",
+            "not a date;Broken;-1,00;x\n",
+            "05.02.2023;Café;-3,00;x\n",
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'statement.csv')
+            with open(path, 'w', encoding='latin-1') as statement:
+                statement.writelines(rows)
+            with patch('parser.LARGE_FILE_SIZE', 0), patch('parser.LARGE_FILE_CHUNK_ROWS', 2), \
+                    patch('parser.pd.read_csv', wraps=pd.read_csv) as read_csv:
+                frame, report = self.parser.parse_bank_statement_frame(path)
+            whole, whole_report = self.parser.parse_bank_statement_frame(path)
+
+        self.assertEqual(read_csv.call_args_list[0].kwargs['chunksize'], 2)
+        self.assertEqual(report['dialect'], whole_report['dialect'])
+        self.assertIn('encoding latin-1', report['dialect'])
+        self.assertEqual(frame['description'].tolist(), ['Rent', 'Groceries', 'Café'])
+        self.assertEqual(report['date_format'], '%d.%m.%Y')
+        self.assertEqual(report['rows_read'], 5)
+        self.assertEqual(report['skipped_non_expenses'], 1)
+        self.assertEqual(report['skipped_invalid_dates'], 1)
+        pd.testing.assert_frame_equal(frame, whole)
+
+    def test_streamed_statement_yields_batches_with_a_running_report(self):
+        csv_data = io.StringIO(
+            "Datum;Name;Betrag\n"
+            "03.02.2023;Rent;-500,00\n"
+            "04.02.2023;Salary;1000,00\n"
+            "05.02.2023;Groceries;-12,50\n"
+            "06.02.2023;Bakery;-3,00\n"
+            "07.02.2023;Cinema;-9,00\n"
+        )
+        report = self.parser.new_report()
+        batches, running = [], []
+        for batch in self.parser.stream_bank_statement(csv_data, report, chunk_rows=2):
+            batches.append(batch)
+            running.append((report['status'], report['rows_read'], report['imported_expenses']))
+        whole, whole_report = self.parser.parse_bank_statement_frame(csv_data)
+
+        self.assertEqual([len(batch) for batch in batches], [1, 2, 1])
+        self.assertEqual(running, [('Importing', 2, 1), ('Importing', 4, 3), ('Importing', 5, 4)])
+        self.assertEqual(report, whole_report)
+        pd.testing.assert_frame_equal(self.parser.combine_batches(batches, report), whole)
+
+    def test_streamed_statement_that_breaks_off_is_not_imported(self):
+        csv_data = io.StringIO(
+            "Datum;Name;Betrag\n"
+            "03.02.2023;Rent;-500,00\n"
+            "04.02.2023;Groceries;-12,50\n"
+            "05.02.2023;Bakery;-3,00\n"
+            "06.02.2023;Cinema;extra;-9,00;x\n"
+        )
+        report = self.parser.new_report()
+        batches = list(self.parser.stream_bank_statement(csv_data, report, chunk_rows=2))
+
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(report['status'], 'Not imported')
+        self.assertIn('after 2 rows', report['details'])
+        self.assertTrue(self.parser.combine_batches(batches, report).empty)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,59 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from scanner import FolderWatcher, Scanner
+
+
+class TestScannerWatch(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.scanner = Scanner(self.test_dir)
+        self.batches = []
+        self.received = threading.Event()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def collect(self, paths):
+        self.batches.append(sorted(paths))
+        self.received.set()
+
+    def test_changes_to_a_statement_are_reported_once_after_the_folder_is_quiet(self):
+        watcher = self.scanner.watch(self.collect, debounce=0.2)
+        if watcher is None:
+            self.skipTest("watchdog is not installed")
+        try:
+            statement = os.path.join(self.test_dir, "statement.csv")
+            with open(statement, "w", encoding="utf-8") as handle:
+                handle.write("Datum;Name;Betrag\n")
+            with open(statement, "a", encoding="utf-8") as handle:
+                handle.write("01.07.2026;Energie;-10,00\n")
+            with open(os.path.join(self.test_dir, "notes.txt"), "w", encoding="utf-8") as handle:
+                handle.write("not a statement")
+
+            self.assertTrue(self.received.wait(5))
+        finally:
+            watcher.stop()
+
+        self.assertEqual(self.batches, [[statement]])
+
+    def test_deleted_and_moved_away_statements_are_not_reported(self):
+        watcher = FolderWatcher(self.test_dir, self.collect, debounce=0)
+        statement, renamed = os.path.join(self.test_dir, "statement.csv"), os.path.join(self.test_dir, "renamed.csv")
+        watcher.dispatch(SimpleNamespace(event_type="deleted", is_directory=False, src_path=statement))
+        watcher.dispatch(SimpleNamespace(event_type="moved", is_directory=False, src_path=statement, dest_path=renamed))
+
+        self.assertTrue(self.received.wait(5))
+        self.assertEqual(self.batches, [[renamed]])
+
+    def test_statement_extension_is_compared_like_the_platform_compares_file_names(self):
+        with patch("scanner.os.path.normcase", str.lower):
+            watcher = FolderWatcher(self.test_dir, self.collect, debounce=0)
+            self.assertTrue(watcher._is_statement(os.path.join(self.test_dir, "STATEMENT.CSV")))
+            self.assertFalse(watcher._is_statement(os.path.join(self.test_dir, "notes.txt")))
+            self.assertFalse(watcher._is_statement(os.path.join(self.test_dir, "archive", "old.csv")))
@@ -0,0 +1,35 @@
+import unittest
+
+import pandas as pd
+
+from search_index import SearchIndex
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.descriptions = pd.Series([
+            "REWE Markt Wien", "Energie-AG Strom", "Amazon.de Marketplace", None, "rewe markt wien",
+        ])
+        self.index = SearchIndex(self.descriptions)
+
+    def rows(self, query):
+        return self.index.matches(query).nonzero()[0].tolist()
+
+    def test_substrings_match_case_insensitively_inside_tokens(self):
+        self.assertEqual(self.rows("mark"), [0, 2, 4])
+        self.assertEqual(self.rows("ENERGIE-ag"), [1])
+        self.assertEqual(self.rows("n.de"), [2])
+        self.assertEqual(self.rows("xyz"), [])
+
+    def test_all_terms_must_match(self):
+        self.assertEqual(self.rows("rewe wien"), [0, 4])
+        self.assertEqual(self.rows("wien strom"), [])
+
+    def test_results_match_a_full_scan(self):
+        for query in ("e", "ma", "rkt", "de"):
+            expected = self.descriptions.fillna("").str.contains(query, case=False, regex=False)
+            self.assertEqual(self.rows(query), expected[expected].index.tolist(), query)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+import pandas as pd
+
+from parser import Parser
+from transaction_db import TransactionDatabase
+
+
+class TestTransactionDatabase(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.statement = os.path.join(self.test_dir, "statement.csv")
+        with open(self.statement, "w", encoding="utf-8") as statement:
+            statement.write("Datum;Name;Betrag\n01.07.2026;Energie;-10,00\n02.08.2026;Other;-5,50\n")
+        self.database = TransactionDatabase(os.path.join(self.test_dir, "transactions.sqlite3"))
+        self.frame, self.report = Parser.parse_bank_statement_frame(self.statement)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_stored_statement_is_returned_while_the_file_is_unchanged(self):
+        self.assertIsNone(self.database.load(self.statement))
+        self.database.save(self.statement, "Scanned", self.frame, self.report)
+
+        frame, report = self.database.load(self.statement)
+
+        pd.testing.assert_frame_equal(frame, self.frame, check_dtype=False)
+        self.assertEqual(report, self.report)
+
+    def test_categories_and_removal_are_persisted(self):
+        self.database.save(self.statement, "Scanned", self.frame, self.report)
+        ids = self.frame["id"].tolist()
+        self.database.save_categories({self.statement: {ids[0]: "Utilities", ids[1]: "Sonstiges"}})
+
+        self.assertEqual(self.database.load(self.statement)[0]["category"].tolist(), ["Utilities", "Sonstiges"])
+        with sqlite3.connect(self.database.path) as connection:
+            rows = connection.execute(
+                "SELECT description FROM transactions WHERE month = ? AND category = ?", ("2026-07", "Utilities")
+            ).fetchall()
+        self.assertEqual(rows, [("Energie",)])
+
+        self.database.remove(self.statement)
+        self.assertIsNone(self.database.load(self.statement))
+
+    def test_statement_outlives_its_file_until_it_is_removed(self):
+        other = os.path.join(self.test_dir, "other.csv")
+        shutil.copy(self.statement, other)
+        self.database.save(self.statement, "Scanned", self.frame, self.report)
+        self.database.save(other, "Imported", self.frame, self.report)
+        self.database.save(self.statement, "Scanned", self.frame, self.report)
+        os.remove(self.statement)
+
+        self.assertEqual(self.database.statements(), [(self.statement, "Scanned"), (other, "Imported")])
+        frame, report = self.database.load(self.statement)
+        pd.testing.assert_frame_equal(frame, self.frame, check_dtype=False)
+
+        self.database.remove(self.statement)
+        self.assertIsNone(self.database.load(self.statement))
+        self.assertEqual(self.database.statements(), [(other, "Imported")])
+
+    def test_statement_stored_by_an_older_parser_is_not_returned_after_its_file_is_gone(self):
+        self.database.save(self.statement, "Scanned", self.frame, self.report)
+        with sqlite3.connect(self.database.path) as connection:
+            connection.execute("UPDATE files SET parser_version = parser_version - 1")
+        os.remove(self.statement)
+
+        self.assertIsNone(self.database.load(self.statement))
+
+    def test_changed_content_is_parsed_again(self):
+        self.database.save(self.statement, "Scanned", self.frame, self.report)
+        stat = os.stat(self.statement)
+        with open(self.statement, "w", encoding="utf-8") as statement:
+            statement.write("Datum;Name;Betrag\n01.07.2026;Energie;-99,00\n02.08.2026;Other;-5,50\n")
+        os.utime(self.statement, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+        self.assertIsNone(self.database.load(self.statement))
+
+
+if __name__ == "__main__":
+    unittest.main()
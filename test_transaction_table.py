@@ -0,0 +1,97 @@
+import os
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from transaction_table import Labels, TransactionTable
+
+
+def statement_frame(*rows):
+    return pd.DataFrame([
+        {"id": transaction_id, "date": pd.Timestamp(date), "month": date[:7], "description": description, "amount": amount}
+        for transaction_id, date, description, amount in rows
+    ])
+
+
+class TestLabels(unittest.TestCase):
+    def test_codes_are_shared_and_missing_values_get_minus_one(self):
+        labels = Labels()
+
+        self.assertEqual(labels.codes(["Rent", None, "Food", "Rent"]).tolist(), [0, -1, 1, 0])
+        self.assertEqual(labels.code("Food"), 1)
+        self.assertEqual(labels.find("Travel"), -1)
+
+    def test_categorical_lists_only_used_labels_in_sorted_order(self):
+        labels = Labels()
+        codes = labels.codes(["Rent", "Unused", "Food", None])
+
+        categorical = labels.categorical(codes[[0, 2, 3]])
+
+        self.assertEqual(categorical.categories.tolist(), ["Food", "Rent"])
+        self.assertEqual(categorical.tolist()[:2], ["Rent", "Food"])
+        self.assertTrue(pd.isna(categorical[2]))
+
+
+class TestTransactionTable(unittest.TestCase):
+    def setUp(self):
+        self.table = TransactionTable()
+        self.table.add("july.csv", "Scanned", statement_frame(
+            ("a", "2026-07-01", "Bäckerei Müller", -3.5), ("b", "2026-07-02", "Miete", -900.0),
+        ), ["Food", "Rent"])
+        self.table.add("august.csv", "Imported", statement_frame(
+            ("c", "2026-08-01", None, -12.0),
+        ), ["Sonstiges"])
+
+    def test_frame_has_typed_columns_in_import_order(self):
+        frame = self.table.to_frame()
+
+        self.assertEqual(frame["id"].tolist(), ["a", "b", "c"])
+        self.assertEqual(frame["description"].tolist()[:2], ["Bäckerei Müller", "Miete"])
+        self.assertTrue(pd.isna(frame["description"].iloc[2]))
+        self.assertEqual(frame["amount"].tolist(), [-3.5, -900.0, -12.0])
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(frame["date"]))
+        for column in ("category", "file", "source", "Month"):
+            self.assertIsInstance(frame[column].dtype, pd.CategoricalDtype)
+        self.assertEqual(frame["file"].tolist(), ["july.csv", "july.csv", "august.csv"])
+        self.assertEqual(frame["Month"].tolist(), ["2026-07", "2026-07", "2026-08"])
+
+    def test_statements_are_removed_as_whole_blocks(self):
+        self.table.discard(self.table.statement("july.csv", "Scanned"))
+
+        self.assertIsNone(self.table.statement("july.csv", "Scanned"))
+        self.assertEqual(len(self.table), 1)
+        self.assertEqual([transaction["category"] for transaction in self.table], ["Sonstiges"])
+        self.assertEqual(self.table.to_frame()["category"].cat.categories.tolist(), ["Sonstiges"])
+
+    def test_statements_are_identified_by_full_path(self):
+        other = self.table.add(os.path.join("archive", "july.csv"), "Scanned", statement_frame(
+            ("z", "2026-07-09", "Kino", -8.0),
+        ), ["Leisure"])
+
+        self.assertIs(self.table.statement(os.path.join("archive", "july.csv"), "Scanned"), other)
+        self.assertEqual(self.table.statement("july.csv", "Scanned").descriptions(), ["Bäckerei Müller", "Miete"])
+        self.assertEqual(other.file, "july.csv")
+
+    def test_category_codes_can_be_changed_in_place(self):
+        statement = self.table.statement("july.csv", "Scanned")
+        statement.category_codes[np.array([1])] = self.table.categories.code("Housing")
+
+        self.assertEqual(statement.category_names(), ["Food", "Housing"])
+        self.assertEqual(self.table.to_frame()["category"].tolist(), ["Food", "Housing", "Sonstiges"])
+
+    def test_statement_block_can_be_extended_by_later_batches(self):
+        statement = self.table.statement("august.csv", "Imported")
+        rows = self.table.extend(statement, statement_frame(
+            ("d", "2026-08-02", "Café", -4.0), ("e", "2026-09-01", None, -1.0),
+        ), ["Food", "Food"])
+
+        self.assertEqual(rows.tolist(), [1, 2])
+        self.assertEqual(len(self.table), 5)
+        self.assertEqual(statement.descriptions(), [None, "Café", None])
+        self.assertEqual(statement.category_names(), ["Sonstiges", "Food", "Food"])
+        self.assertEqual(self.table.to_frame()["Month"].tolist()[-3:], ["2026-08", "2026-08", "2026-09"])
+
+
+if __name__ == "__main__":
+    unittest.main()
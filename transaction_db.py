@@ -0,0 +1,203 @@
+"""SQLite database of imported statements, their transactions and assigned categories."""
+
+import json
+import os
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pandas as pd
+
+from app_paths import user_data_dir
+from parse_cache import CACHE_VERSION, file_fingerprint, is_unchanged
+
+
+# Bump whenever the tables below change; older databases are rebuilt from the statements.
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    original_path TEXT NOT NULL,
+    source TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    parser_version INTEGER NOT NULL,
+    report TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS transactions (
+    file_path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    id TEXT,
+    date TEXT,
+    month TEXT,
+    description TEXT,
+    amount REAL,
+    category TEXT,
+    PRIMARY KEY (file_path, position)
+);
+CREATE INDEX IF NOT EXISTS transactions_date ON transactions(date);
+CREATE INDEX IF NOT EXISTS transactions_month ON transactions(month);
+CREATE INDEX IF NOT EXISTS transactions_category ON transactions(category);
+CREATE INDEX IF NOT EXISTS transactions_id ON transactions(id);
+"""
+
+COLUMNS = ["id", "date", "month", "description", "amount", "category"]
+
+
+class TransactionDatabase:
+    """Keeps every imported statement, its transactions and their categories.
+
+    The database, not the CSV files, holds the imported data: a statement stays stored after
+    its file is deleted until it is removed explicitly. The file fingerprints only decide
+    whether a statement whose file still exists has to be parsed again. Each call opens its
+    own connection, so imports on a worker thread and category updates on the GUI thread do
+    not share one.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path is not None else user_data_dir() / "transactions.sqlite3"
+        self._initialized = False
+
+    @staticmethod
+    def _key(path):
+        return os.path.normcase(os.path.abspath(str(path)))
+
+    def _connect(self):
+        if not self._initialized:
+            os.makedirs(self.path.parent, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute("PRAGMA foreign_keys = ON")
+        # With write-ahead logging this still survives application crashes and is much faster.
+        connection.execute("PRAGMA synchronous = NORMAL")
+        if not self._initialized:
+            connection.execute("PRAGMA journal_mode = WAL")
+            if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                connection.executescript(
+                    "DROP TABLE IF EXISTS transactions; DROP TABLE IF EXISTS files;"
+                    f"PRAGMA user_version = {SCHEMA_VERSION};"
+                )
+            connection.executescript(SCHEMA)
+            self._initialized = True
+        return connection
+
+    def statements(self):
+        """Return the ``(path, source)`` of every stored statement, oldest first."""
+        try:
+            with closing(self._connect()) as connection:
+                return connection.execute("SELECT original_path, source FROM files ORDER BY rowid").fetchall()
+        except sqlite3.Error as error:
+            print(f"Could not read stored statements: {error}")
+            return []
+
+    def is_current(self, path):
+        """Tell whether ``load`` returns the stored statement of ``path``, without reading its transactions."""
+        try:
+            with closing(self._connect()) as connection, connection:
+                return self._current_report(connection, path) is not None
+        except (OSError, sqlite3.Error) as error:
+            print(f"Could not read stored statement {path}: {error}")
+            return False
+
+    def load(self, path):
+        """Return the stored ``(frame, report)`` of a statement, or ``None`` if it has to be parsed.
+
+        A statement whose file was deleted is returned as stored; one whose file changed is not, and
+        neither is one stored by an older parser.
+        The frame carries the categories last saved with ``save_categories``.
+        """
+        try:
+            with closing(self._connect()) as connection, connection:
+                report = self._current_report(connection, path)
+                if report is None:
+                    return None
+                rows = connection.execute(
+                    "SELECT id, date, month, description, amount, category FROM transactions "
+                    "WHERE file_path = ? ORDER BY position", (self._key(path),)
+                ).fetchall()
+        except (OSError, sqlite3.Error) as error:
+            print(f"Could not read stored statement {path}: {error}")
+            return None
+
+        frame = pd.DataFrame.from_records(rows, columns=COLUMNS)
+        frame["date"] = pd.to_datetime(frame["date"], format="ISO8601")
+        frame["amount"] = frame["amount"].astype(float)
+        return frame, json.loads(report)
+
+    def _current_report(self, connection, path):
+        """Return the stored report text of an up-to-date statement, otherwise ``None``."""
+        key = self._key(path)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            stat = None
+        entry = connection.execute(
+            "SELECT size, mtime_ns, sha256, parser_version, report FROM files WHERE path = ?", (key,)
+        ).fetchone()
+        if entry is None:
+            return None
+        size, mtime_ns, sha256, parser_version, report = entry
+        if parser_version != CACHE_VERSION:
+            if stat is None:
+                print(f"Stored statement {path} is from an older version and its file is gone; it cannot be read again.")
+            return None
+        if stat is not None:
+            if not is_unchanged(path, stat, (size, mtime_ns, sha256)):
+                return None
+            if mtime_ns != stat.st_mtime_ns:
+                # Touched but unchanged; the new mtime spares hashing the content next time.
+                connection.execute("UPDATE files SET mtime_ns = ? WHERE path = ?", (stat.st_mtime_ns, key))
+        return report
+
+    def save(self, path, source, frame, report):
+        """Replace a statement's transactions and report, fingerprinted by size, mtime and content hash.
+
+        ``source`` records how the file was imported, e.g. 'Scanned' or 'Imported'.
+        """
+        key = self._key(path)
+        size, mtime_ns, sha256 = file_fingerprint(path)
+        frame = frame.reindex(columns=COLUMNS)
+        columns = [frame[column].astype(object).where(frame[column].notna(), None).tolist() for column in COLUMNS]
+        # ISO text sorts chronologically, so the date index also serves range queries.
+        dates = pd.to_datetime(frame["date"]).to_numpy().astype("datetime64[s]")
+        columns[COLUMNS.index("date")] = [None if text == "NaT" else text for text in dates.astype(str).tolist()]
+        rows = zip([key] * len(frame), range(len(frame)), *columns)
+        try:
+            with closing(self._connect()) as connection, connection:
+                connection.execute("DELETE FROM transactions WHERE file_path = ?", (key,))
+                # Updating the row in place keeps the statement's place in the import order.
+                connection.execute(
+                    "INSERT INTO files (path, original_path, source, size, mtime_ns, sha256, parser_version, report) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (path) DO UPDATE SET original_path = excluded.original_path, "
+                    "source = excluded.source, size = excluded.size, mtime_ns = excluded.mtime_ns, sha256 = excluded.sha256, "
+                    "parser_version = excluded.parser_version, report = excluded.report",
+                    (
+                        key, str(path), source, size, mtime_ns, sha256, CACHE_VERSION,
+                        json.dumps(dict(report), default=str),
+                    ),
+                )
+                connection.executemany("INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        except sqlite3.Error as error:
+            raise OSError(f"Could not store statement {path}: {error}") from error
+
+    def save_categories(self, categories):
+        """Record re-assigned categories in one transaction, given as ``{statement path: {id: category}}``."""
+        try:
+            with closing(self._connect()) as connection, connection:
+                for path, assigned in categories.items():
+                    key = self._key(path)
+                    connection.executemany(
+                        "UPDATE transactions SET category = ? WHERE id = ? AND file_path = ?",
+                        ((category, transaction_id, key) for transaction_id, category in assigned.items()),
+                    )
+        except sqlite3.Error as error:
+            raise OSError(f"Could not store categories: {error}") from error
+
+    def remove(self, path):
+        """Delete a stored statement and its transactions."""
+        try:
+            with closing(self._connect()) as connection, connection:
+                connection.execute("DELETE FROM files WHERE path = ?", (self._key(path),))
+        except sqlite3.Error as error:
+            raise OSError(f"Could not remove stored statement {path}: {error}") from error
@@ -0,0 +1,195 @@
+"""Columnar storage of the imported transactions, one block of NumPy columns per statement."""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+
+def statement_key(path, source):
+    """Identity of an imported statement: its normalized full path and how it was imported."""
+    return os.path.normcase(os.path.abspath(str(path))), source
+
+
+class Labels:
+    """Interned labels; every distinct value is stored once and referred to by its integer code."""
+
+    def __init__(self):
+        self.values: list[str] = []
+        self._codes: dict[str, int] = {}
+
+    def __len__(self):
+        return len(self.values)
+
+    def code(self, value):
+        """Code of ``value``, added on first use."""
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def find(self, value):
+        """Code of ``value``, or -1 when it has never been used."""
+        return self._codes.get(value, -1)
+
+    def codes(self, values):
+        """Codes of many values; missing values get -1."""
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+        mapping = np.array([self.code(value) for value in uniques] + [-1], dtype=np.int32)
+        # pandas gives missing values code -1, which picks the trailing -1 above.
+        return mapping[codes]
+
+    def categorical(self, codes):
+        """Categorical of ``codes`` with the used labels as sorted categories, like ``astype("category")``."""
+        used = np.flatnonzero(np.bincount(codes[codes >= 0], minlength=len(self.values)))
+        names = [self.values[code] for code in used]
+        order = sorted(range(len(names)), key=names.__getitem__)
+        remap = np.full(len(self.values) + 1, -1, dtype=np.int32)
+        remap[used[order]] = np.arange(len(order), dtype=np.int32)
+        return pd.Categorical.from_codes(remap[codes], categories=[names[position] for position in order])
+
+
+class StatementTransactions:
+    """The transactions imported from one statement, stored column by column.
+
+    Category and month are codes into the table's shared ``Labels``; path and source are the
+    same for every row and kept once, and ``file`` is the path's file name shown in the table.
+    Descriptions are one UTF-8 buffer plus the end offset of every description in the decoded text.
+    """
+
+    __slots__ = (
+        "path", "file", "source", "key", "ids", "dates", "amounts", "category_codes", "month_codes",
+        "categories", "months", "_descriptions", "_description_ends", "_missing_descriptions",
+    )
+
+    def __init__(self, path, source, frame, categories, category_labels, month_labels):
+        self.path, self.file, self.source = str(path), os.path.basename(str(path)), source
+        self.key = statement_key(path, source)
+        self.categories, self.months = category_labels, month_labels
+        size = len(frame)
+        self.ids = frame["id"].to_numpy(dtype=object) if "id" in frame else np.full(size, None, dtype=object)
+        self.dates = pd.to_datetime(frame["date"]).to_numpy(dtype="datetime64[us]")
+        self.amounts = frame["amount"].to_numpy(dtype=np.float64)
+        self.category_codes = category_labels.codes(categories)
+        months = frame["month"] if "month" in frame else pd.Series(self.dates).dt.strftime("%Y-%m")
+        self.month_codes = month_labels.codes(months.tolist())
+        descriptions = frame["description"]
+        missing = descriptions.isna().to_numpy()
+        self._missing_descriptions = missing if missing.any() else None
+        descriptions = descriptions.astype(object).where(~missing, "").tolist()
+        self._descriptions = "".join(descriptions).encode("utf-8")
+        self._description_ends = np.cumsum(np.fromiter(map(len, descriptions), dtype=np.int64, count=size))
+
+    def __len__(self):
+        return len(self.amounts)
+
+    def extend(self, frame, categories):
+        """Append more transactions of the same statement and return the positions of the new rows."""
+        batch = StatementTransactions(self.path, self.source, frame, categories, self.categories, self.months)
+        start, offset = len(self), int(self._description_ends[-1]) if len(self) else 0
+        self.ids = np.concatenate([self.ids, batch.ids])
+        self.dates = np.concatenate([self.dates, batch.dates])
+        self.amounts = np.concatenate([self.amounts, batch.amounts])
+        self.category_codes = np.concatenate([self.category_codes, batch.category_codes])
+        self.month_codes = np.concatenate([self.month_codes, batch.month_codes])
+        if self._missing_descriptions is not None or batch._missing_descriptions is not None:
+            self._missing_descriptions = np.concatenate([
+                self._missing_descriptions if self._missing_descriptions is not None else np.zeros(start, dtype=bool),
+                batch._missing_descriptions if batch._missing_descriptions is not None else np.zeros(len(batch), dtype=bool),
+            ])
+        self._descriptions += batch._descriptions
+        self._description_ends = np.concatenate([self._description_ends, batch._description_ends + offset])
+        return np.arange(start, len(self))
+
+    def descriptions(self):
+        """All descriptions as strings, ``None`` where a description is missing."""
+        text = self._descriptions.decode("utf-8")
+        ends = self._description_ends.tolist()
+        descriptions = [text[start:end] for start, end in zip([0] + ends[:-1], ends)]
+        if self._missing_descriptions is not None:
+            for row in np.flatnonzero(self._missing_descriptions).tolist():
+                descriptions[row] = None
+        return descriptions
+
+    def category_names(self, rows=None):
+        codes = self.category_codes if rows is None else self.category_codes[rows]
+        return [self.categories.values[code] for code in codes.tolist()]
+
+    def records(self):
+        """Row dicts with the columns of a parsed statement plus file and source."""
+        months = [self.months.values[code] if code >= 0 else None for code in self.month_codes.tolist()]
+        for transaction_id, date, month, description, amount, category in zip(
+            self.ids, pd.DatetimeIndex(self.dates), months, self.descriptions(), self.amounts.tolist(), self.category_names(),
+        ):
+            yield {
+                "id": transaction_id, "date": date, "month": month, "description": description,
+                "amount": amount, "category": category, "file": self.file, "source": self.source,
+            }
+
+
+class TransactionTable:
+    """All imported transactions as statement blocks in import order.
+
+    Adding or removing a statement touches only its own block; ``to_frame`` concatenates
+    the columns once per data change. Iterating yields row dicts, which is convenient but
+    slow; the store itself works on the blocks.
+    """
+
+    def __init__(self):
+        self.statements: list[StatementTransactions] = []
+        self.categories = Labels()
+        self.months = Labels()
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for statement in self.statements:
+            yield from statement.records()
+
+    def add(self, path, source, frame, categories):
+        """Append a statement's transactions with their assigned categories and return its block."""
+        statement = StatementTransactions(path, source, frame, categories, self.categories, self.months)
+        self.statements.append(statement)
+        self._size += len(statement)
+        return statement
+
+    def extend(self, statement, frame, categories):
+        """Append more transactions to a statement's block, e.g. the next batch of a streamed import."""
+        rows = statement.extend(frame, categories)
+        self._size += len(rows)
+        return rows
+
+    def statement(self, path, source):
+        """Block of the statement imported from ``path``; files with the same name in other folders are separate."""
+        key = statement_key(path, source)
+        return next((statement for statement in self.statements if statement.key == key), None)
+
+    def discard(self, statement):
+        """Drop the given block."""
+        self.statements.remove(statement)
+        self._size -= len(statement)
+
+    def to_frame(self):
+        """Typed transaction frame with categorical category, file, source and Month columns."""
+        statements = self.statements
+        lengths = np.array([len(statement) for statement in statements], dtype=np.int64)
+        files, sources = Labels(), Labels()
+        file_codes = np.repeat(np.array([files.code(statement.file) for statement in statements], dtype=np.int32), lengths)
+        source_codes = np.repeat(np.array([sources.code(statement.source) for statement in statements], dtype=np.int32), lengths)
+        return pd.DataFrame({
+            "id": self._concatenate([statement.ids for statement in statements], object),
+            "date": self._concatenate([statement.dates for statement in statements], "datetime64[us]"),
+            "description": [description for statement in statements for description in statement.descriptions()],
+            "amount": self._concatenate([statement.amounts for statement in statements], np.float64),
+            "category": self.categories.categorical(self._concatenate([statement.category_codes for statement in statements], np.int32)),
+            "file": files.categorical(file_codes),
+            "source": sources.categorical(source_codes),
+            "Month": self.months.categorical(self._concatenate([statement.month_codes for statement in statements], np.int32)),
+        })
+
+    @staticmethod
+    def _concatenate(columns, dtype):
+        return np.concatenate(columns) if columns else np.array([], dtype=dtype)